@@ -1,180 +1,335 @@
 # app.py
-import re
-import socket
-from contextlib import contextmanager
+import logging
+import time
+from datetime import datetime
 
 import streamlit as st
-from mcstatus import JavaServer, BedrockServer
-from streamlit_autorefresh import st_autorefresh
+
+from mcstat import targets as target_list
+from mcstat.cache import ResultCache
+from mcstat.detect import DETECTOR
+from mcstat.history import RESOLUTIONS, HistoryStore
+from mcstat.metrics import Metrics
+from mcstat.motd import to_html as motd_html
+from mcstat.policy import AdaptivePolicy
+from mcstat.poller import Poller, signature
+from mcstat.result import ProbeResult
+from mcstat.ring import RingStore, sparkline
+from mcstat.sweep import run_batch
+from mcstat.trace import JsonlExporter, set_exporter
+
+log = logging.getLogger("mcstat.app")
 
 # -------------------- Defaults --------------------
 DEFAULT_HOST = "xaprosmp.xyz"
-DEFAULT_EDITION = "Java"            # or "Bedrock" if your server is Bedrock
+DEFAULT_EDITION = "Java"            # "Bedrock" if your server is Bedrock, "Auto" to detect it
+EDITIONS = ["Java", "Bedrock", "Auto"]
 DEFAULT_JAVA_PORT = 25565
 DEFAULT_BEDROCK_PORT = 19132
-TIMEOUT_MS = 2500                   # fixed timeout (no UI slider)
+TIMEOUT_MS = 2500                   # per-check budget (no UI slider); split into attempts adaptively
+UDP_RETRIES = 2                     # Bedrock: re-ping within the budget after a lost reply
+CACHE_TTL_S = 30                    # results shared by every viewer for this long
+CACHE_MAX_TARGETS = 512             # LRU bound on distinct (edition, host, port)
+PROBE_MODE = "fast"                 # "full" adds a separate ping round-trip per check
+POLL_INTERVAL_S = 30                # background poller re-probes watched targets this often
+WATCH_EVERY_S = 5                   # auto-refresh: status panel re-reads the poller's result (no probe, no full rerun)
+SWEEP_WORKERS = 32                  # dashboard: parallel probes per refresh
+HISTORY_DB = "history.sqlite3"      # every real probe is appended here
+CHART_WINDOWS = {"Hour": 3600, "Day": 86400, "Week": 7 * 86400}
+SPARK_POINTS = 120                  # recent probes per target kept in memory for sparklines (~1 h when polled)
+SPARK_MAX_BYTES = 4 << 20           # ceiling over all targets' sparkline buffers
+METRICS_ADDR = ("127.0.0.1", 9108)  # Prometheus scrape endpoint (/metrics); None to disable
+TRACE_FILE = None                   # e.g. "probes.otlp.jsonl": per-phase spans of every probe, OTLP/JSON
 
 st.set_page_config(page_title="Minecraft Server Status", page_icon="⛏️", layout="centered")
 st.title("Minecraft Server Status")
 
+# -------------------- Shared resources --------------------
+@st.cache_resource
+def _result_cache() -> ResultCache:
+    # One cache per process, shared across sessions and reruns
+    return ResultCache(ttl=CACHE_TTL_S, maxsize=CACHE_MAX_TARGETS)
+
+@st.cache_resource
+def _history() -> HistoryStore:
+    store = HistoryStore(HISTORY_DB)
+    _result_cache().subscribe(store.record)
+    return store
+
+@st.cache_resource
+def _rings() -> RingStore:
+    rings = RingStore(capacity=SPARK_POINTS, max_bytes=SPARK_MAX_BYTES)
+    _result_cache().subscribe(rings.observe)
+    return rings
+
+@st.cache_resource
+def _metrics() -> Metrics:
+    metrics = Metrics(cache=_result_cache(), maxsize=CACHE_MAX_TARGETS)
+    _result_cache().subscribe(metrics.observe)
+    if METRICS_ADDR:
+        try:
+            metrics.serve(*METRICS_ADDR)
+        except OSError as e:    # e.g. a second app process on the same host
+            log.warning("metrics endpoint on %s:%s disabled: %s", *METRICS_ADDR, e)
+    return metrics
+
+@st.cache_resource
+def _tracing():
+    if TRACE_FILE:
+        set_exporter(JsonlExporter(TRACE_FILE))
+
+@st.cache_resource
+def _policy() -> AdaptivePolicy:
+    # Per-target timeouts learned from recent probe times, shared by every session
+    return AdaptivePolicy(udp_retries=UDP_RETRIES)
+
+def _probe(key, max_age=None):
+    return _probe_aged(key, max_age)[0]
+
+def _probe_aged(key, max_age=None):
+    # (result, seconds since it was probed): the poller stamps snapshots with the probe's own time
+    edition, host, port = key
+    if edition == "Auto":               # race both editions; the winner is remembered per host
+        return _result_cache().get_aged(key, lambda: DETECTOR.check(host, port, TIMEOUT_MS, PROBE_MODE, _policy().check),
+                                        max_age=max_age)
+    return _result_cache().get_aged(key, lambda: _policy().check(host, port, edition, TIMEOUT_MS, PROBE_MODE),
+                                    max_age=max_age)
+
+@st.cache_resource
+def _poller() -> Poller:
+    # Scheduled polls take a cached result up to half an interval old; "Check now" always probes
+    return Poller(_probe_aged, interval=POLL_INTERVAL_S, max_age=POLL_INTERVAL_S / 2).start()
+
+_history()
+_rings()
+_metrics()
+_tracing()
+
+def _footer():
+    st.divider()
+    stats = _result_cache().stats()
+    rings = _rings().stats()
+    st.caption(f"Cache: {stats['hits']} hits, {stats['misses']} probes, {stats['coalesced']} coalesced "
+               f"(TTL {CACHE_TTL_S} s, {stats['size']} targets) · sparklines: {rings['targets']} targets, "
+               f"{rings['bytes'] // 1024} of {rings['max_bytes'] // 1024} KiB")
+    st.caption("Java → TCP 25565, Bedrock → UDP 19132, Auto → both at once. Auto-refresh can be toggled above.")
+
+def _freshness(snap):
+    if snap is None:
+        return ""
+    changed = datetime.fromtimestamp(st.session_state.get("last_changed", snap.checked_at)).strftime("%H:%M:%S")
+    return f"checked {int(time.time() - snap.checked_at)} s ago · unchanged since {changed}"
+
+_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+
+view = st.radio("View", ["Single server", "Dashboard"], horizontal=True, label_visibility="collapsed")
+
+# -------------------- Dashboard --------------------
+if view == "Dashboard":
+    if "targets_text" not in st.session_state:
+        st.session_state.targets_text = f"java://{DEFAULT_HOST}:{DEFAULT_JAVA_PORT}"
+    text = st.text_area("Targets (one per line)", key="targets_text", height=140,
+                        help="host, host:port, bedrock://host:port, auto://host or host,port,edition")
+    upload = st.file_uploader("…or load a target list", type=["toml", "csv", "txt"])
+    if st.checkbox("Auto-refresh every 30 s", value=True, key="dash_auto"):
+        from streamlit_autorefresh import st_autorefresh
+        st_autorefresh(interval=30_000, key="mc_dash_auto")
+    st.button("Check now", type="primary", key="dash_check")
+
+    try:
+        targets = target_list.load(upload.name, upload.getvalue()) if upload else target_list.parse_text(text)
+    except ValueError as e:
+        st.error(f"Could not parse targets: {e}")
+        st.stop()
+
+    rows, wall = run_batch(targets, _probe, workers=SWEEP_WORKERS)
+    trend = getattr(getattr(st, "column_config", None), "LineChartColumn", None)   # Streamlit >= 1.23
+    table = []
+    for target, r in rows:
+        detected = f" ({'+'.join(r.editions)})" if r.editions else ""
+        window = _rings().window(target) if trend else None
+        table.append({
+            "Target": target_list.format_target(target) + detected,
+            "Status": "UP" if r.up else "DOWN",
+            "Latency (ms)": round(r.latency_ms) if r.latency_ms is not None else None,
+            "Players": r.players_online,
+            "Max": r.players_max,
+            "Version": r.version or None,
+            "Error": r.error,
+            **({"Latency trend": [v if v == v else None for v in window.latency] if window else []}
+               if trend else {}),
+        })
+    up = sum(1 for row in table if row["Status"] == "UP")
+    st.caption(f"{up}/{len(table)} up · swept {len(table)} targets in {wall * 1000:.0f} ms "
+               f"({min(SWEEP_WORKERS, len(table))} workers)")
+    st.dataframe(table, use_container_width=True, hide_index=True,
+                 column_config={"Latency trend": trend("Latency trend", help=f"Last {SPARK_POINTS} checks, ms",
+                                                       y_min=0)} if trend else None)
+    _footer()
+    st.stop()
+
 # -------------------- Session defaults --------------------
 if "host" not in st.session_state:
     st.session_state.host = DEFAULT_HOST
 if "edition" not in st.session_state:
     st.session_state.edition = DEFAULT_EDITION
 if "port" not in st.session_state:
-    st.session_state.port = DEFAULT_JAVA_PORT if DEFAULT_EDITION == "Java" else DEFAULT_BEDROCK_PORT
+    st.session_state.port = target_list.DEFAULT_PORTS.get(DEFAULT_EDITION, 0)
 
 # -------------------- Controls --------------------
 with st.container():
     colA, colB, colC = st.columns([1, 1.4, 0.9])
     with colA:
         edition = st.radio(
-            "Edition", ["Java", "Bedrock"], horizontal=True,
-            index=0 if st.session_state.edition == "Java" else 1
+            "Edition", EDITIONS, horizontal=True, index=EDITIONS.index(st.session_state.edition),
+            help="Auto tries Java and Bedrock at once and remembers which one answered"
         )
     with colB:
         host = st.text_input("Host / IP", value=st.session_state.host, placeholder="e.g., play.example.org")
     with colC:
-        default_port = DEFAULT_JAVA_PORT if edition == "Java" else DEFAULT_BEDROCK_PORT
-        port = st.number_input("Port", value=int(st.session_state.port or default_port),
-                               min_value=1, max_value=65535, step=1)
+        if edition == "Auto":
+            port = st.number_input("Port", value=0, min_value=0, max_value=65535, step=1,
+                                   help="0 = 25565 for Java and 19132 for Bedrock")
+        else:
+            default_port = DEFAULT_JAVA_PORT if edition == "Java" else DEFAULT_BEDROCK_PORT
+            port = st.number_input("Port", value=int(st.session_state.port or default_port),
+                                   min_value=1, max_value=65535, step=1)
 
     # One-click reset to your server
     if st.button(f"Use {DEFAULT_HOST}", key="use_default"):
         st.session_state.host = DEFAULT_HOST
         st.session_state.edition = DEFAULT_EDITION
-        st.session_state.port = DEFAULT_JAVA_PORT if DEFAULT_EDITION == "Java" else DEFAULT_BEDROCK_PORT
+        st.session_state.port = target_list.DEFAULT_PORTS.get(DEFAULT_EDITION, 0)
         if hasattr(st, "rerun"):
             st.rerun()
         else:
             st.experimental_rerun()
 
     auto = st.checkbox("Auto-refresh every 30 s", value=True)
-    if auto:
+    if auto and _fragment is None:      # older Streamlit: rerun the whole page on a timer
+        from streamlit_autorefresh import st_autorefresh
         st_autorefresh(interval=30_000, key="mc_auto")
 
-    # Manual check; pressing the button triggers a rerun
-    st.button("Check now", type="primary")
+    # Manual check; pressing the button triggers a rerun and an immediate probe
+    check_now = st.button("Check now", type="primary")
 
 # Persist any edits
 st.session_state.host = host.strip() or DEFAULT_HOST
 st.session_state.edition = edition
-st.session_state.port = int(port) if port else (DEFAULT_JAVA_PORT if edition == "Java" else DEFAULT_BEDROCK_PORT)
+if edition == "Auto":
+    st.session_state.port = int(port or 0)
+else:
+    st.session_state.port = int(port) if port else (DEFAULT_JAVA_PORT if edition == "Java" else DEFAULT_BEDROCK_PORT)
 
-# -------------------- Helpers --------------------
-@contextmanager
-def _temp_socket_timeout(seconds: float):
-    prev = socket.getdefaulttimeout()
-    socket.setdefaulttimeout(seconds)
-    try:
-        yield
-    finally:
-        socket.setdefaulttimeout(prev)
+# -------------------- Check & Render --------------------
+# Status and history are fragments: with auto-refresh on they rerun on their own
+# timers while the controls above stay put; only a control change reruns the page.
+def _panel_view(key, result) -> tuple:
+    """The costly parts of the status panel (MOTD HTML, sparklines, timing rows), built once per snapshot."""
+    motd_block = None
+    if result.up and result.motd_spans:     # the server's own colours and styles, on a dark panel like in-game
+        motd_block = (f'<div style="background:#1e1e1e;color:#AAAAAA;padding:0.5em 0.75em;border-radius:4px;'
+                      f'font-family:monospace">{motd_html(result.motd_spans)}</div>')
+    spark_block = None
+    window = _rings().window(key)
+    if window is not None and len(window.ts) > 1:
+        spark_block = (f'<div style="display:flex;gap:2em;align-items:center;font-size:0.8em;color:gray">'
+                       f'<span>Latency {sparkline(window.latency)}</span>'
+                       f'<span>Players {sparkline(window.players, color="#5FB760")}</span>'
+                       f'<span>last {len(window.ts)} checks</span></div>')
+    rows, total = [], None
+    phases = result.phases
+    if phases:
+        total = result.duration_ms or sum(phases.values()) or 1.0
+        rows = [{"Phase": "\u2003" * name.count(".") + name.rsplit(".", 1)[-1], "ms": round(ms, 2),
+                 "Share": f"{ms / total:.0%}"} for name, ms in phases.items()]
+    return motd_block, spark_block, rows, total
 
-def _status_with_timeout(server, secs: float):
-    """Call server.status() compatibly across mcstatus versions."""
-    try:
-        return server.status(timeout=secs)  # newer mcstatus
-    except TypeError:
-        with _temp_socket_timeout(secs):    # older mcstatus
-            return server.status()
+def _status_panel(key):
+    poller = _poller()
+    poller.watch(key)                   # keeps the target polled while the page itself sits still
+    snap = poller.latest(key)
+    check_now = st.session_state.pop("check_pending", False)   # consumed once, not replayed on ticks
+    if snap is None or check_now:
+        # Only a cold target or an explicit "Check now" waits on the network
+        with st.spinner("Pinging..."):
+            snap = poller.wait(key, TIMEOUT_MS / 1000 + 1, newer_than=snap.checked_at if snap else 0.0)
+    result = snap.result if snap else ProbeResult(False, error="No result yet, waiting for the first probe")
 
-def _ping_with_timeout(server, secs: float):
-    try:
-        return server.ping(timeout=secs)
-    except TypeError:
-        with _temp_socket_timeout(secs):
-            return server.ping()
-    except Exception:
-        return None
-
-# Strip Minecraft formatting codes, including hex §x sequences
-_MC_HEX_SEQ = re.compile(r"§x(§[0-9a-fA-F]){6}")
-_MC_CODE_SEQ = re.compile(r"[§&][0-9a-fk-orA-FK-OR]")
-
-def _strip_mc_codes(s: str) -> str:
-    s = _MC_HEX_SEQ.sub("", s)
-    s = _MC_CODE_SEQ.sub("", s)
-    s = re.sub(r"\s+", " ", s).strip()
-    return s
-
-def _clean_motd(desc) -> str | None:
-    if desc is None:
-        return None
-    try:
-        text = str(desc)
-    except Exception:
-        return None
-    return _strip_mc_codes(text)
+    # Remember when what this session sees last changed (latency in steps with hysteresis, so jitter
+    # around a step edge does not count as a change)
+    last = st.session_state.get("last_sig")
+    sig = (key, signature(result, last[1] if last and last[0] == key else None))
+    if last != sig:
+        st.session_state.last_sig = sig
+        st.session_state.last_changed = snap.checked_at if snap else time.time()
 
-def check_status(host: str, port: int, edition: str, timeout_ms: int):
-    secs = max(0.1, timeout_ms / 1000.0)
-    try:
-        if edition == "Bedrock":
-            server = BedrockServer.lookup(f"{host}:{port}")
-            stat = _status_with_timeout(server, secs)
-
-            # Normalize fields across mcstatus versions
-            players_online = getattr(stat, "players_online", None)
-            players_max    = getattr(stat, "players_max", None)
-            latency        = getattr(stat, "latency", None) or _ping_with_timeout(server, secs)
-            ver_obj        = getattr(stat, "version", None)  # BedrockStatusVersion
-            version_name   = (getattr(ver_obj, "name", None) if ver_obj is not None else None) or (str(ver_obj) if ver_obj is not None else None)
-            motd_clean     = _clean_motd(getattr(stat, "motd", None))
-
-            return {
-                "up": True, "edition": "bedrock",
-                "latency_ms": latency,
-                "players": {"online": players_online, "max": players_max},
-                "version": {"name": version_name},
-                "motd": motd_clean,
-            }
-
-        else:  # Java
-            server = JavaServer.lookup(f"{host}:{port}")  # SRV-aware
-            stat = _status_with_timeout(server, secs)
-
-            players     = getattr(stat, "players", None)
-            online      = getattr(players, "online", None) if players else None
-            maxp        = getattr(players, "max", None) if players else None
-            ver_obj     = getattr(stat, "version", None)
-            version_name= (getattr(ver_obj, "name", None) if ver_obj is not None else None) or (str(ver_obj) if ver_obj is not None else None)
-            latency     = getattr(stat, "latency", None) or _ping_with_timeout(server, secs)
-            motd_clean  = _clean_motd(getattr(stat, "description", None))
-
-            return {
-                "up": True, "edition": "java",
-                "latency_ms": latency,
-                "players": {"online": online, "max": maxp},
-                "version": {"name": version_name},
-                "motd": motd_clean,
-            }
-
-    except Exception as e:
-        return {"up": False, "error": str(e)}
+    # A tick that finds the same snapshot reuses what the last one built; only the captions move
+    stamp = (key, snap.checked_at if snap else None)
+    view = st.session_state.get("panel_view")
+    if view is None or view[0] != stamp:
+        view = st.session_state.panel_view = (stamp, _panel_view(key, result))
+    motd_block, spark_block, timing_rows, total = view[1]
 
-# -------------------- Check & Render --------------------
-with st.spinner("Pinging..."):
-    result = check_status(st.session_state.host, st.session_state.port, st.session_state.edition, TIMEOUT_MS)
-
-target = f"{st.session_state.edition.lower()}://{st.session_state.host}:{st.session_state.port}"
-st.caption(f"Target: `{target}`")
-
-if result.get("up"):
-    st.success("UP")
-    c1, c2, c3 = st.columns(3)
-    c1.metric("Latency", f"{int(result.get('latency_ms') or 0)} ms")
-    p = result.get("players") or {}
-    c2.metric("Players", f"{p.get('online') or 0} / {p.get('max') or '?'}")
-    v = (result.get("version") or {}).get("name")
-    c3.metric("Version", str(v or "n/a"))   # ensure string (handles Bedrock object)
-    motd = result.get("motd")
-    if motd:
-        st.caption(f"MOTD: `{motd}`")
-else:
-    st.error("DOWN")
-    st.code(result.get("error", "unreachable"))
+    st.caption(f"Target: `{target_list.format_target(key)}`" + (f" · {_freshness(snap)}" if snap else ""))
+    if result.editions:
+        st.caption(f"Detected: {' + '.join(result.editions)} on port {result.port}"
+                   + (" (hybrid server)" if len(result.editions) > 1 else "")
+                   + (" · cached" if result.detected_from == "cache" else ""))
+
+    if result.up:
+        st.success("UP")
+        c1, c2, c3 = st.columns(3)
+        dns_ms = result.dns_ms
+        c1.metric("Latency", f"{int(result.latency_ms or 0)} ms",
+                  help=f"DNS resolution: {dns_ms:.0f} ms (0 when cached)" if dns_ms is not None else None)
+        c2.metric("Players", f"{result.players_online or 0} / {result.players_max or '?'}")
+        c3.metric("Version", result.version or "n/a")
+        if motd_block:
+            st.markdown(motd_block, unsafe_allow_html=True)
+        elif result.motd:
+            st.caption(f"MOTD: `{result.motd}`")
+    else:
+        st.error("DOWN")
+        st.code(result.error or "unreachable")
+
+    if spark_block:
+        st.markdown(spark_block, unsafe_allow_html=True)
+
+    if timing_rows:
+        with st.expander("Probe timings"):
+            st.caption(f"Last probe took {total:.1f} ms (sub-phases are indented under their parent).")
+            st.dataframe(timing_rows, use_container_width=True, hide_index=True)
+
+# -------------------- History --------------------
+def _history_panel(key):
+    window = st.radio("History", list(CHART_WINDOWS), horizontal=True)
+    span = CHART_WINDOWS[window]
+    store = _history()
+    bucket = store.resolution_for(span)        # pre-aggregated: bounded rows whatever the window
+    rows = list(store.rollups(key, bucket, time.time() - span))
+    if rows:
+        times = [datetime.fromtimestamp(r.ts) for r in rows]
+        st.caption(f"Latency (ms), {bucket // 60} min buckets")
+        st.line_chart({"time": times, "avg": [r.lat_avg for r in rows], "p95": [r.lat_p95 for r in rows],
+                       "max": [r.lat_max for r in rows]}, x="time")
+        st.caption("Players online")
+        st.line_chart({"time": times, "min": [r.online_min for r in rows], "avg": [r.online_avg for r in rows],
+                       "max": [r.online_max for r in rows]}, x="time")
+    else:
+        st.caption("No history for this target yet; charts appear once the first bucket closes.")
+
+key = (st.session_state.edition, st.session_state.host, st.session_state.port)
+if check_now:
+    _poller().watch(key)
+    _poller().refresh(key)
+    st.session_state.check_pending = True
+if _fragment is not None:
+    # Status ticks often but only rebuilds its HTML when a new snapshot is in (memory reads only);
+    # charts follow the finest rollup bucket
+    _status_panel = _fragment(run_every=WATCH_EVERY_S if auto else None)(_status_panel)
+    _history_panel = _fragment(run_every=min(RESOLUTIONS) if auto else None)(_history_panel)
+_status_panel(key)
+_history_panel(key)
 
-st.divider()
-st.caption("Java → TCP 25565, Bedrock → UDP 19132. MOTD formatting codes stripped. Auto-refresh can be toggled above.")
+_footer()
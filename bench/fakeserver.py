@@ -0,0 +1,252 @@
+"""In-process stand-ins for Minecraft servers, for benchmarks and offline checks.
+
+``FakeJavaServer`` speaks the Java Server List Ping over TCP (handshake,
+status request/response, ping/pong); ``FakeBedrockServer`` answers RakNet
+unconnected pings over UDP. Both run on one private asyncio loop in a daemon
+thread and take an artificial delay, a loss probability and a padded MOTD size::
+
+    with FakeJavaServer(delay=0.02, motd_bytes=2048) as java:
+        check_status("127.0.0.1", java.port, "Java", 2500)
+
+Production pathologies are scripted per connection (Java) or per datagram
+(Bedrock) with :class:`Behavior`: pass one, a list (the last entry repeats) or
+a ``callable(index) -> Behavior`` as ``script``::
+
+    FakeJavaServer(script=[Behavior(half_open=True), Behavior()])   # hang once, then recover
+"""
+import asyncio
+import json
+import random
+import struct
+import threading
+from dataclasses import dataclass
+
+BEDROCK_MAGIC = bytes.fromhex("00ffff00fefefefefdfdfdfd12345678")
+
+
+# -------------------- Wire helpers --------------------
+def _varint(n: int) -> bytes:
+    n &= 0xFFFFFFFF
+    out = bytearray()
+    while True:
+        byte = n & 0x7F
+        n >>= 7
+        if n:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+def _packet(packet_id: int, payload: bytes) -> bytes:
+    body = _varint(packet_id) + payload
+    return _varint(len(body)) + body
+
+def _string(s: str) -> bytes:
+    data = s.encode("utf-8")
+    return _varint(len(data)) + data
+
+async def _read_varint(reader: asyncio.StreamReader) -> int:
+    result = 0
+    for shift in range(0, 35, 7):
+        byte = (await reader.readexactly(1))[0]
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result
+    raise ValueError("varint too long")
+
+def _take_varint(data: bytes, pos: int) -> tuple[int, int]:
+    result = 0
+    for shift in range(0, 35, 7):
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+    raise ValueError("varint too long")
+
+
+# -------------------- Scripting --------------------
+@dataclass(frozen=True)
+class Behavior:
+    """What the server does for one connection (Java) or one ping (Bedrock)."""
+    delay: float = 0.0                  # seconds before each response
+    handshake_delay: float = 0.0        # Java: stall before reading the handshake
+    drop: bool = False                  # read the request, never answer (lost UDP pong)
+    half_open: bool = False             # Java: accept, then go silent without closing
+    reset: bool = False                 # Java: close straight after accept
+    truncate_json: int | None = None    # Java: cut the status JSON to this many chars
+    cut_after: int | None = None        # Java: send this many bytes of the response, then close
+    motd_bytes: int | None = None       # override the server's MOTD size
+
+
+# -------------------- Shared loop --------------------
+class _Loop:
+    """One background event loop shared by every fake server in the process."""
+    _lock = threading.Lock()
+    _loop = None
+
+    @classmethod
+    def get(cls) -> asyncio.AbstractEventLoop:
+        with cls._lock:
+            if cls._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="fake-mc", daemon=True).start()
+                cls._loop = loop
+            return cls._loop
+
+    @classmethod
+    def run(cls, coro):
+        return asyncio.run_coroutine_threadsafe(coro, cls.get()).result()
+
+
+class _FakeServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, delay: float = 0.0, loss: float = 0.0,
+                 motd_bytes: int = 0, online: int = 3, max_players: int = 20, seed: int | None = None,
+                 script=None):
+        self.host = host
+        self.port = port
+        self.loss = loss                # probability a request is silently dropped (on top of the script)
+        self.online = online
+        self.max_players = max_players
+        self.requests = 0               # connections (Java) / pings (Bedrock) seen so far
+        self.script = script if script is not None else Behavior(delay=delay, motd_bytes=motd_bytes)
+        self._rng = random.Random(seed)
+        self._server = None
+
+    def motd(self, behavior: Behavior = Behavior()) -> str:
+        base = "A Minecraft Server"
+        return base + "x" * max(0, (behavior.motd_bytes or 0) - len(base))
+
+    def _next_behavior(self) -> Behavior:
+        index = self.requests
+        self.requests += 1
+        script = self.script
+        if callable(script):
+            behavior = script(index)
+        elif isinstance(script, (list, tuple)):
+            behavior = script[min(index, len(script) - 1)]
+        else:
+            behavior = script
+        if self.loss > 0 and self._rng.random() < self.loss:
+            behavior = Behavior(drop=True)
+        return behavior
+
+    def start(self):
+        _Loop.run(self._start())
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            _Loop.run(self._stop())
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+# -------------------- Java (TCP) --------------------
+class FakeJavaServer(_FakeServer):
+    protocol = 767
+    version = "1.21"
+
+    def status_json(self, behavior: Behavior = Behavior()) -> str:
+        text = json.dumps({
+            "version": {"name": self.version, "protocol": self.protocol},
+            "players": {"online": self.online, "max": self.max_players},
+            "description": {"text": self.motd(behavior)},
+        })
+        return text if behavior.truncate_json is None else text[:behavior.truncate_json]
+
+    async def _start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def _stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        behavior = self._next_behavior()
+        try:
+            if behavior.reset:
+                return
+            if behavior.handshake_delay:
+                await asyncio.sleep(behavior.handshake_delay)
+            while True:
+                length = await _read_varint(reader)
+                data = await reader.readexactly(length)
+                packet_id, pos = _take_varint(data, 0)
+                if behavior.half_open or behavior.drop:
+                    await reader.read()                             # hold the socket until the client gives up
+                    return
+                if packet_id == 0x00 and pos == len(data):          # status request
+                    response = _packet(0x00, _string(self.status_json(behavior)))
+                elif packet_id == 0x00:                             # handshake, no reply
+                    continue
+                elif packet_id == 0x01:                             # ping: echo the token
+                    response = _packet(0x01, data[pos:pos + 8])
+                else:
+                    return
+                if behavior.delay:
+                    await asyncio.sleep(behavior.delay)
+                if behavior.cut_after is not None:
+                    writer.write(response[:behavior.cut_after])
+                    await writer.drain()
+                    return
+                writer.write(response)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+# -------------------- Bedrock (UDP) --------------------
+class _BedrockProtocol(asyncio.DatagramProtocol):
+    def __init__(self, server: "FakeBedrockServer"):
+        self.server = server
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr):
+        server = self.server
+        if not data or data[0] != 0x01:
+            return
+        behavior = server._next_behavior()
+        if behavior.drop:
+            return
+        pong = server.pong(data[1:9], behavior)
+        if behavior.delay:
+            asyncio.get_running_loop().call_later(behavior.delay, self.transport.sendto, pong, addr)
+        else:
+            self.transport.sendto(pong, addr)
+
+
+class FakeBedrockServer(_FakeServer):
+    protocol = 671
+    version = "1.20.80"
+
+    def advertisement(self, behavior: Behavior = Behavior()) -> str:
+        fields = ["MCPE", self.motd(behavior).replace(";", ""), str(self.protocol), self.version,
+                  str(self.online), str(self.max_players), "1234567890", "Bedrock level", "Survival",
+                  "1", str(self.port), str(self.port + 1)]
+        return ";".join(fields) + ";"
+
+    def pong(self, client_time: bytes, behavior: Behavior = Behavior()) -> bytes:
+        ad = self.advertisement(behavior).encode("utf-8")[:0xFFFF]
+        return (b"\x1c" + client_time + struct.pack(">q", 0x1234) + BEDROCK_MAGIC
+                + struct.pack(">H", len(ad)) + ad)
+
+    async def _start(self):
+        loop = asyncio.get_running_loop()
+        self._server, _ = await loop.create_datagram_endpoint(
+            lambda: _BedrockProtocol(self), local_addr=(self.host, self.port))
+        self.port = self._server.get_extra_info("sockname")[1]
+
+    async def _stop(self):
+        self._server.close()
@@ -0,0 +1,103 @@
+"""Process-farm scaling benchmark: probes/sec per added worker process.
+
+Sweeps the same target list with the in-process asyncio engine and with
+:func:`mcstat.farm.farm_sweep` at 1, 2, … worker processes, and reports wall
+time, probes/sec, speedup over one worker and per-core efficiency. The fake
+servers run in their own processes so they do not share a GIL with the
+coordinator or the workers.
+
+    python bench/farm_bench.py --targets 2000 --processes 1,2,4,8 --motd-bytes 2048
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from fakeserver import FakeBedrockServer, FakeJavaServer  # noqa: E402
+from mcstat.aio import sweep  # noqa: E402
+from mcstat.farm import farm_sweep  # noqa: E402
+
+
+def _serve(conn, opts: dict):
+    """Run one fake Java and one fake Bedrock server until the parent says stop."""
+    with FakeJavaServer(**opts) as java, FakeBedrockServer(**opts) as bedrock:
+        conn.send({"Java": java.port, "Bedrock": bedrock.port})
+        conn.recv()
+
+
+def start_servers(n: int, opts: dict) -> tuple[list, list]:
+    ctx = multiprocessing.get_context("spawn")
+    procs, ports = [], []
+    for _ in range(n):
+        parent, child = ctx.Pipe()
+        proc = ctx.Process(target=_serve, args=(child, opts), daemon=True)
+        proc.start()
+        procs.append((proc, parent))
+        ports.append(parent.recv())
+    return procs, ports
+
+
+def stop_servers(procs: list):
+    for proc, conn in procs:
+        conn.send(None)
+        proc.join(timeout=2)
+
+
+def run(processes: int, targets: list, args) -> tuple[float, int]:
+    start = time.perf_counter()
+    if processes == 0:
+        async def collect():
+            return [r async for _, r in sweep(targets, args.timeout_ms, args.concurrency)]
+        results = asyncio.run(collect())
+    else:
+        results = [r for _, r in farm_sweep(targets, args.timeout_ms, processes, args.concurrency, retries=None)]
+    return time.perf_counter() - start, sum(1 for r in results if r.up)
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--targets", type=int, default=2000)
+    p.add_argument("--processes", default=None, help="comma-separated worker counts (default: 1,2,4,… up to the CPUs)")
+    p.add_argument("--edition", choices=["Java", "Bedrock", "both"], default="both")
+    p.add_argument("--delay-ms", type=float, default=10.0, help="artificial server delay per response")
+    p.add_argument("--motd-bytes", type=int, default=1024, help="pad the MOTD to this size (parsing is the CPU cost)")
+    p.add_argument("--servers", type=int, default=2, help="fake server processes")
+    p.add_argument("--timeout-ms", type=int, default=5000)
+    p.add_argument("--concurrency", type=int, default=256, help="probes in flight per process")
+    args = p.parse_args()
+
+    cpus = os.cpu_count() or 1
+    counts = ([int(x) for x in args.processes.split(",")] if args.processes
+              else [n for n in (1, 2, 4, 8, 16, 32, 64) if n <= cpus] or [1])
+    opts = {"delay": args.delay_ms / 1000, "motd_bytes": args.motd_bytes, "seed": 1}
+    editions = ["Java", "Bedrock"] if args.edition == "both" else [args.edition]
+
+    procs, ports = start_servers(args.servers, opts)
+    try:
+        targets = [(editions[i % len(editions)], "127.0.0.1", ports[i % len(ports)][editions[i % len(editions)]])
+                   for i in range(args.targets)]
+        print(f"{cpus} CPUs, {len(targets)} targets, {args.servers} fake server processes")
+        print(f"{'processes':<12}{'wall ms':>10}{'probes/s':>10}{'speedup':>9}{'per core':>10}{'up':>7}")
+        base = None
+        for n in [0, *counts]:
+            wall, up = run(n, targets, args)
+            rate = len(targets) / wall
+            if n == 1:
+                base = rate
+            speedup = f"{rate / base:.2f}x" if base and n else "-"
+            per_core = f"{rate / base / n:.0%}" if base and n else "-"
+            label = str(n) if n else "in-process"
+            print(f"{label:<12}{wall * 1000:>10.1f}{rate:>10.0f}{speedup:>9}{per_core:>10}{up:>7}", flush=True)
+    finally:
+        stop_servers(procs)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
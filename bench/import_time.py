@@ -0,0 +1,64 @@
+"""Cold-start benchmark for the headless probe path.
+
+Imports ``mcstat.cli`` in fresh interpreters and fails (exit 1) when the
+median import time exceeds the budget, or when a heavy dependency that should
+only load on first use (Streamlit, mcstatus, dnspython, asyncio, sqlite3)
+ends up on the import path.
+
+    python bench/import_time.py [--runs 15] [--budget-ms 60] [--module mcstat.cli]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFERRED = ("streamlit", "mcstatus", "dns", "asyncio", "sqlite3")
+
+_SNIPPET = """
+import json, sys, time
+t0 = time.perf_counter()
+import {module}
+ms = (time.perf_counter() - t0) * 1000
+print(json.dumps({{"ms": ms, "modules": sorted({{m.split(".")[0] for m in sys.modules}})}}))
+"""
+
+
+def measure(module: str, runs: int) -> tuple[list, set]:
+    times, loaded = [], set()
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", _SNIPPET.format(module=module)],
+                             cwd=ROOT, check=True, capture_output=True, text=True).stdout
+        sample = json.loads(out)
+        times.append(sample["ms"])
+        loaded.update(sample["modules"])
+    return times, loaded
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--runs", type=int, default=15)
+    p.add_argument("--budget-ms", type=float, default=60.0)
+    p.add_argument("--module", default="mcstat.cli")
+    args = p.parse_args()
+
+    times, loaded = measure(args.module, args.runs)
+    median = statistics.median(times)
+    print(f"import {args.module}: median {median:.1f} ms, min {min(times):.1f} ms, "
+          f"max {max(times):.1f} ms over {args.runs} runs (budget {args.budget_ms:.0f} ms)")
+
+    failed = False
+    leaked = sorted(set(DEFERRED) & loaded)
+    if leaked:
+        print(f"FAIL: imported eagerly: {', '.join(leaked)}")
+        failed = True
+    if median > args.budget_ms:
+        print(f"FAIL: cold import regressed past the {args.budget_ms:.0f} ms budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
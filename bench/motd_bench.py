@@ -0,0 +1,109 @@
+"""MOTD cleaning micro-benchmark: the old three-pass stripper vs the current parser.
+
+Cleans a sweep-like corpus (a few hundred distinct MOTDs, each seen once per
+sweep) and reports µs per MOTD for the legacy implementation, the span walk
+without its cache and the memoized :func:`mcstat.motd.parse` used by probes,
+for legacy-coded strings and for the same MOTDs as JSON chat components.
+Exits 1 if the plain text differs or if a cold parse (no cache), which also
+yields the styled spans, is slower than the legacy stripper beyond
+``--tolerance``; the cached rows are informational.
+
+    python bench/motd_bench.py [--servers 500] [--sweeps 20]
+"""
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from mcstat import motd  # noqa: E402
+
+# The implementation this replaced, kept verbatim for comparison
+_MC_HEX_SEQ = re.compile(r"§x(§[0-9a-fA-F]){6}")
+_MC_CODE_SEQ = re.compile(r"[§&][0-9a-fk-orA-FK-OR]")
+
+def legacy_strip(s: str) -> str:
+    s = _MC_HEX_SEQ.sub("", s)
+    s = _MC_CODE_SEQ.sub("", s)
+    s = re.sub(r"\s+", " ", s).strip()
+    return s
+
+
+_WORDS = ["Survival", "Skyblock", "Network", "NOW LIVE", "1.8-1.21", "Factions", "Welcome to", "SMP",
+          "discord.gg/example", "Season 4", "PvP", "Minigames", "BedWars", "»", "✦"]
+
+def corpus(n: int, seed: int = 1) -> list:
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        parts = []
+        for _ in range(rng.randint(3, 12)):
+            r = rng.random()
+            if r < 0.35:
+                parts.append(rng.choice("§&") + rng.choice("0123456789abcdefklmnor"))
+            elif r < 0.45:
+                parts.append("§x" + "".join("§" + rng.choice("0123456789abcdef") for _ in range(6)))
+            parts.append(rng.choice(_WORDS) + rng.choice([" ", "  ", "\n", " \n  "]))
+        out.append("".join(parts))
+    return out
+
+
+def as_component(s: str) -> dict:
+    """The same MOTD as a Java chat component: one child per line, legacy codes inline."""
+    return {"text": "", "color": "gray", "extra": [{"text": line + "\n", "bold": i == 0}
+                                                  for i, line in enumerate(s.split("\n"))]}
+
+
+def timed(fn, motds: list, sweeps: int) -> float:
+    start = time.perf_counter()
+    for _ in range(sweeps):
+        for s in motds:
+            fn(s)
+    return (time.perf_counter() - start) / (sweeps * len(motds)) * 1e6
+
+
+def best_of(fns: list, motds: list, sweeps: int) -> list:
+    """Fastest sweep of each uncached function, interleaved so machine noise hits all of them alike."""
+    best = [float("inf")] * len(fns)
+    for _ in range(sweeps):
+        for i, fn in enumerate(fns):
+            best[i] = min(best[i], timed(fn, motds, 1))
+    return best
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--servers", type=int, default=500, help="distinct MOTDs per sweep")
+    p.add_argument("--sweeps", type=int, default=20)
+    p.add_argument("--tolerance", type=float, default=1.25, help="max cold parse / legacy time ratio (noise allowance)")
+    args = p.parse_args()
+
+    motds = corpus(args.servers)
+    mismatched = [s for s in motds if legacy_strip(s) != motd.parse(s).plain]
+    if mismatched:
+        print(f"FAIL: {len(mismatched)} MOTDs clean differently, e.g. {mismatched[0]!r}")
+        return 1
+
+    components = [as_component(s) for s in motds]
+    motd._parse_text.cache_clear()
+    motd._parse_component.cache_clear()
+    legacy, cold = best_of([legacy_strip, motd._build], motds, args.sweeps)
+    rows = [("legacy (3 passes)", legacy),
+            ("span walk, uncached", cold),
+            ("parse (probe path)", timed(motd.parse, motds, args.sweeps)),
+            ("component, uncached", best_of([motd._build], components, args.sweeps)[0]),
+            ("component, parse", timed(motd.parse, components, args.sweeps))]
+    for name, us in rows:
+        print(f"{name:<22}{us:>8.2f} µs/MOTD{legacy / us:>8.1f}x")
+    if cold > legacy * args.tolerance:
+        print(f"FAIL: a cold parse takes {cold / legacy:.2f}x the legacy stripper's time (max {args.tolerance}x)")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
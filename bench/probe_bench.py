@@ -0,0 +1,109 @@
+"""Probe pipeline benchmark against in-process fake servers.
+
+Runs the sequential (``check_status`` in a loop), threaded (``run_batch``) and
+asyncio (``aio.sweep``) engines over 1–1000 targets and reports wall time,
+probes/sec, p50/p99 of the measured latency, success count and, with
+``--memory``, the peak traced allocation of each run.
+
+    python bench/probe_bench.py --targets 1,10,100,1000 --delay-ms 20 --loss 0.01
+"""
+import argparse
+import asyncio
+import math
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from fakeserver import FakeBedrockServer, FakeJavaServer  # noqa: E402
+from mcstat.aio import sweep  # noqa: E402
+from mcstat.probe import check_status  # noqa: E402
+from mcstat.sweep import run_batch  # noqa: E402
+
+ENGINES = ("sequential", "threaded", "async")
+
+
+def percentile(values: list, pct: float):
+    values = sorted(values)
+    if not values:
+        return None
+    return values[max(0, math.ceil(pct / 100 * len(values)) - 1)]
+
+
+def run_engine(engine: str, targets: list, args) -> list:
+    def probe(target):
+        edition, host, port = target
+        return check_status(host, port, edition, args.timeout_ms)
+
+    if engine == "sequential":
+        return [probe(t) for t in targets]
+    if engine == "threaded":
+        rows, _ = run_batch(targets, probe, workers=args.workers)
+        return [r for _, r in rows]
+
+    async def collect():
+        return [r async for _, r in sweep(targets, args.timeout_ms, args.concurrency)]
+    return asyncio.run(collect())
+
+
+def bench(engine: str, targets: list, args) -> dict:
+    start = time.perf_counter()
+    results = run_engine(engine, targets, args)
+    wall = time.perf_counter() - start
+    latencies = [r.latency_ms for r in results if r.up and r.latency_ms is not None]
+    row = {
+        "wall_ms": wall * 1000, "per_s": len(targets) / wall if wall else float("inf"),
+        "p50": percentile(latencies, 50), "p99": percentile(latencies, 99),
+        "up": sum(1 for r in results if r.up), "peak_kib": None,
+    }
+    if args.memory:
+        tracemalloc.start()
+        run_engine(engine, targets, args)
+        row["peak_kib"] = tracemalloc.get_traced_memory()[1] / 1024
+        tracemalloc.stop()
+    return row
+
+
+def _fmt(value, spec: str) -> str:
+    return "-" if value is None else format(value, spec)
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--targets", default="1,10,100,1000", help="comma-separated target counts")
+    p.add_argument("--engines", default=",".join(ENGINES))
+    p.add_argument("--edition", choices=["Java", "Bedrock", "both"], default="both")
+    p.add_argument("--delay-ms", type=float, default=10.0, help="artificial server delay per response")
+    p.add_argument("--loss", type=float, default=0.0, help="probability a request is dropped")
+    p.add_argument("--motd-bytes", type=int, default=0, help="pad the MOTD to this size")
+    p.add_argument("--timeout-ms", type=int, default=2500)
+    p.add_argument("--workers", type=int, default=32, help="threaded engine pool size")
+    p.add_argument("--concurrency", type=int, default=256, help="async engine semaphore")
+    p.add_argument("--max-sequential", type=int, default=100, help="skip the sequential engine above this")
+    p.add_argument("--memory", action="store_true", help="extra tracemalloc run per row")
+    args = p.parse_args()
+
+    opts = {"delay": args.delay_ms / 1000, "loss": args.loss, "motd_bytes": args.motd_bytes, "seed": 1}
+    editions = ["Java", "Bedrock"] if args.edition == "both" else [args.edition]
+    print(f"{'engine':<11}{'edition':<9}{'targets':>8}{'wall ms':>10}{'probes/s':>10}"
+          f"{'p50 ms':>8}{'p99 ms':>8}{'up':>6}{'peak KiB':>10}")
+    with FakeJavaServer(**opts) as java, FakeBedrockServer(**opts) as bedrock:
+        ports = {"Java": java.port, "Bedrock": bedrock.port}
+        for edition in editions:
+            for n in (int(x) for x in args.targets.split(",")):
+                targets = [(edition, "127.0.0.1", ports[edition])] * n
+                for engine in args.engines.split(","):
+                    if engine == "sequential" and n > args.max_sequential:
+                        continue
+                    row = bench(engine, targets, args)
+                    print(f"{engine:<11}{edition:<9}{n:>8}{row['wall_ms']:>10.1f}{row['per_s']:>10.0f}"
+                          f"{_fmt(row['p50'], '.1f'):>8}{_fmt(row['p99'], '.1f'):>8}{row['up']:>6}"
+                          f"{_fmt(row['peak_kib'], '.0f'):>10}", flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
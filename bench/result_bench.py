@@ -0,0 +1,95 @@
+"""Result record micro-benchmark: nested dicts vs :class:`mcstat.result.ProbeResult`.
+
+For a typical UP result reports µs per construction (as the probe path builds
+it), per render-style read of players/version, per change-detection signature,
+and the serialized size as JSON, pickle and the fixed binary layout.
+Exits 1 if a binary round trip loses anything.
+
+    python bench/result_bench.py [--runs 200000]
+"""
+import argparse
+import json
+import pickle
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from mcstat import motd  # noqa: E402
+from mcstat.result import ProbeResult  # noqa: E402
+
+PHASES = {"resolve": 0.4, "status": 21.7, "status.connect": 3.1, "status.handshake": 0.2, "status.read": 18.3,
+          "motd": 0.01}
+MOTD = motd.parse("§6§lSkyblock §7» §aNOW LIVE\n§bdiscord.gg/example")
+
+
+def as_dict() -> dict:
+    """The shape ``check_status`` returned before ProbeResult, built the same way."""
+    result = {"up": True, "edition": "java", "latency_ms": 21.7, "players": {"online": 12, "max": 100},
+              "version": {"name": "Paper 1.21.1"}, "motd": MOTD.plain, "motd_spans": MOTD.spans}
+    result["dns_ms"] = 0.4
+    result["duration_ms"] = 22.3
+    result["phases"] = PHASES
+    return result
+
+
+def as_record() -> ProbeResult:
+    result = ProbeResult(True, "java", 12, 100, "Paper 1.21.1", MOTD.plain, MOTD.spans, latency_ms=21.7, dns_ms=0.4)
+    return result.timed(22.3, PHASES)
+
+
+def dict_read(r: dict):
+    players = r.get("players") or {}
+    return players.get("online"), players.get("max"), (r.get("version") or {}).get("name"), r.get("latency_ms")
+
+
+def record_read(r: ProbeResult):
+    return r.players_online, r.players_max, r.version, r.latency_ms
+
+
+def dict_signature(r: dict):
+    players = r.get("players") or {}
+    latency = r.get("latency_ms")
+    return (bool(r.get("up")), r.get("error"), players.get("online"), players.get("max"),
+            (r.get("version") or {}).get("name"), r.get("motd"), None if latency is None else int(latency // 25))
+
+
+def record_signature(r: ProbeResult):
+    return hash(r), None if r.latency_ms is None else int(r.latency_ms // 25)
+
+
+def timed(fn, runs: int, *args) -> float:
+    start = time.perf_counter()
+    for _ in range(runs):
+        fn(*args)
+    return (time.perf_counter() - start) / runs * 1e6
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--runs", type=int, default=200_000)
+    args = p.parse_args()
+
+    d, r = as_dict(), as_record()
+    back = ProbeResult.from_bytes(r.to_bytes())
+    if back != r or back.phases != r.phases or back.latency_ms != r.latency_ms:
+        print(f"FAIL: binary round trip changed the result: {back}")
+        return 1
+
+    rows = [("construct", timed(as_dict, args.runs), timed(as_record, args.runs)),
+            ("read fields", timed(dict_read, args.runs, d), timed(record_read, args.runs, r)),
+            ("signature", timed(dict_signature, args.runs, d), timed(record_signature, args.runs, r))]
+    print(f"{'':<14}{'dict µs':>10}{'record µs':>11}")
+    for name, old, new in rows:
+        print(f"{name:<14}{old:>10.3f}{new:>11.3f}")
+    print(f"{'size':<14}{'json':>10}{'pickle':>11}{'binary':>9}")
+    print(f"{'dict':<14}{len(json.dumps(d)):>10}{len(pickle.dumps(d, pickle.HIGHEST_PROTOCOL)):>11}{'-':>9}")
+    print(f"{'record':<14}{len(json.dumps(r.as_dict())):>10}{len(pickle.dumps(r, pickle.HIGHEST_PROTOCOL)):>11}"
+          f"{len(r.to_bytes()):>9}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""Failure-injection regression run against scripted fake servers.
+
+Drives ``check_status`` through the production pathologies the fake servers
+can script (slow handshakes, stalls past the deadline, truncated or cut-off
+status JSON, half-open and reset TCP, oversized MOTDs, dropped UDP pongs, with
+and without the adaptive retry policy) and checks each probe lands on the
+expected UP/DOWN path within the timeout.
+Exits 1 on any mismatch.
+
+    python bench/scenarios.py [--timeout-ms 1000] [--slack-ms 250] [--only half-open]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import NamedTuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from fakeserver import Behavior, FakeBedrockServer, FakeJavaServer  # noqa: E402
+from mcstat.policy import AdaptivePolicy  # noqa: E402
+from mcstat.probe import check_status  # noqa: E402
+
+BIG_MOTD = 32 * 1024
+
+
+class Scenario(NamedTuple):
+    name: str
+    edition: str
+    script: object          # Behavior, list of Behavior, or callable(index) -> Behavior
+    expect: tuple           # "up" / "down" per consecutive probe
+    min_motd: int = 0       # for UP probes: the MOTD must survive at least this long
+    retries: bool = False   # probe through AdaptivePolicy (timeout_ms becomes the budget)
+
+
+def scenarios(timeout_s: float) -> list:
+    stall = timeout_s * 2
+    return [
+        Scenario("healthy", "Java", Behavior(), ("up",)),
+        Scenario("slow-handshake", "Java", Behavior(handshake_delay=timeout_s / 4), ("up",)),
+        Scenario("stalled-handshake", "Java", Behavior(handshake_delay=stall), ("down",)),
+        Scenario("slow-status", "Java", Behavior(delay=stall), ("down",)),
+        Scenario("truncated-json", "Java", Behavior(truncate_json=40), ("down",)),
+        Scenario("cut-response", "Java", Behavior(cut_after=12), ("down",)),
+        Scenario("half-open", "Java", Behavior(half_open=True), ("down",)),
+        Scenario("reset", "Java", Behavior(reset=True), ("down",)),
+        Scenario("oversized-motd", "Java", Behavior(motd_bytes=BIG_MOTD), ("up",), min_motd=BIG_MOTD // 2),
+        Scenario("recovers", "Java", [Behavior(half_open=True), Behavior()], ("down", "up")),
+        Scenario("bedrock-healthy", "Bedrock", Behavior(), ("up",)),
+        Scenario("bedrock-slow-pong", "Bedrock", Behavior(delay=timeout_s / 4), ("up",)),
+        Scenario("bedrock-dropped-pong", "Bedrock", Behavior(drop=True), ("down",)),
+        Scenario("bedrock-late-pong", "Bedrock", Behavior(delay=stall), ("down",)),
+        Scenario("bedrock-flaky", "Bedrock", [Behavior(drop=True), Behavior()], ("down", "up")),
+        Scenario("bedrock-flaky-retried", "Bedrock", [Behavior(drop=True), Behavior()], ("up",), retries=True),
+        Scenario("bedrock-dead-retried", "Bedrock", Behavior(drop=True), ("down",), retries=True),
+    ]
+
+
+def run(scenario: Scenario, timeout_ms: int, slack_ms: float) -> list:
+    """Probe the scenario's server once per expected outcome; return the failures."""
+    server_cls = FakeJavaServer if scenario.edition == "Java" else FakeBedrockServer
+    failures = []
+    with server_cls(script=scenario.script) as server:
+        for i, expected in enumerate(scenario.expect):
+            start = time.perf_counter()
+            probe = AdaptivePolicy().check if scenario.retries else check_status
+            result = probe("127.0.0.1", server.port, scenario.edition, timeout_ms)
+            elapsed = (time.perf_counter() - start) * 1000
+            got = "up" if result.up else "down"
+            where = f"probe {i + 1}"
+            if got != expected:
+                failures.append(f"{where}: expected {expected}, got {got} ({result.error or 'no error'})")
+            if elapsed > timeout_ms + slack_ms:
+                failures.append(f"{where}: took {elapsed:.0f} ms, over the {timeout_ms} ms deadline")
+            if got == "up" and len(result.motd or "") < scenario.min_motd:
+                failures.append(f"{where}: MOTD cut to {len(result.motd or '')} chars")
+            if got == "down" and not result.error:
+                failures.append(f"{where}: DOWN without an error message")
+    return failures
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--timeout-ms", type=int, default=1000)
+    p.add_argument("--slack-ms", type=float, default=250.0, help="allowed overrun past the timeout")
+    p.add_argument("--only", action="append", default=[], help="run just the named scenario(s)")
+    args = p.parse_args()
+
+    failed = False
+    for scenario in scenarios(args.timeout_ms / 1000):
+        if args.only and scenario.name not in args.only:
+            continue
+        failures = run(scenario, args.timeout_ms, args.slack_ms)
+        print(f"{'FAIL' if failures else 'ok':<5}{scenario.edition:<9}{scenario.name}", flush=True)
+        for failure in failures:
+            print(f"     {failure}")
+        failed |= bool(failures)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+"""Shared probe plumbing for the Minecraft status app."""
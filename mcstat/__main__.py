@@ -0,0 +1,7 @@
+import time
+
+_T0 = time.perf_counter()
+
+from .cli import main  # noqa: E402  (timed import)
+
+raise SystemExit(main(t0=_T0))
@@ -0,0 +1,111 @@
+"""Java server pinned to a pre-resolved IP (needs mcstatus' lower-level modules).
+
+Imported lazily by :mod:`mcstat.compat`; an ImportError here means the installed
+mcstatus lays its internals out differently and probes connect by name instead.
+"""
+import contextlib
+import socket
+import time
+
+from mcstatus import JavaServer
+from mcstatus.pinger import AsyncServerPinger, ServerPinger
+from mcstatus.protocol.connection import TCPAsyncSocketConnection, TCPSocketConnection
+
+
+class _NoTrace:
+    @staticmethod
+    def span(name):
+        return contextlib.nullcontext()
+
+
+class _DeadlineSocket:
+    """Socket whose every send/recv gets only what is left of one overall budget.
+
+    A plain socket timeout bounds each operation, so a server trickling a byte
+    at a time could hold a probe open indefinitely.
+    """
+    __slots__ = ("_sock", "_end")
+
+    def __init__(self, sock, secs: float):
+        self._sock = sock
+        self._end = time.monotonic() + secs
+
+    def _arm(self):
+        left = self._end - time.monotonic()
+        if left <= 0:
+            raise socket.timeout("probe deadline exceeded")
+        self._sock.settimeout(left)
+
+    def recv(self, *args):
+        self._arm()
+        return self._sock.recv(*args)
+
+    def recv_into(self, *args):
+        self._arm()
+        return self._sock.recv_into(*args)
+
+    def send(self, *args):
+        self._arm()
+        return self._sock.send(*args)
+
+    def sendall(self, *args):
+        self._arm()
+        return self._sock.sendall(*args)
+
+    def __getattr__(self, name):
+        return getattr(self._sock, name)
+
+
+class PinnedJavaServer(JavaServer):
+    """JavaServer that connects to ``ip`` but handshakes with the original host name.
+
+    A probe may set ``trace`` (see :mod:`mcstat.trace`) to get status broken
+    down into connect / handshake / read spans.
+    """
+    trace = _NoTrace
+
+    def __init__(self, endpoint, timeout: float):
+        super().__init__(endpoint.host, endpoint.port, timeout)
+        self._sockaddr = (endpoint.ip, endpoint.port)
+
+    def _connect(self) -> TCPSocketConnection:
+        """Connection bounded as a whole by ``self.timeout``, connect included."""
+        start = time.monotonic()
+        connection = TCPSocketConnection(self._sockaddr, self.timeout)
+        connection.socket = _DeadlineSocket(connection.socket, self.timeout - (time.monotonic() - start))
+        return connection
+
+    def status(self, tries: int = 1):
+        with self.trace.span("connect"):
+            connection = self._connect()
+        with connection:
+            pinger = ServerPinger(connection, address=self.address)
+            with self.trace.span("handshake"):
+                pinger.handshake()
+            with self.trace.span("read"):
+                return pinger.read_status()
+
+    def ping(self, tries: int = 1):
+        with self._connect() as connection:
+            pinger = ServerPinger(connection, address=self.address)
+            pinger.handshake()
+            return pinger.test_ping()
+
+    async def async_status(self, tries: int = 1):
+        connection = TCPAsyncSocketConnection(self._sockaddr, self.timeout)
+        with self.trace.span("connect"):
+            await connection.__aenter__()
+        try:
+            pinger = AsyncServerPinger(connection, address=self.address)
+            with self.trace.span("handshake"):
+                pinger.handshake()
+            with self.trace.span("read"):
+                return await pinger.read_status()
+        finally:
+            await connection.__aexit__(None, None, None)
+
+    async def async_ping(self, tries: int = 1):
+        async with TCPAsyncSocketConnection(self._sockaddr, self.timeout) as connection:
+            pinger = AsyncServerPinger(connection, address=self.address)
+            pinger.handshake()
+            return await pinger.test_ping()
@@ -0,0 +1,94 @@
+"""Asyncio probe engine for sweeping many servers at once.
+
+A sweep over N targets costs roughly one timeout instead of N of them: every
+probe runs concurrently (bounded by a semaphore) under its own deadline, and
+results are yielded in completion order.
+"""
+import asyncio
+
+from . import compat
+from .probe import Deadline, error_result, finish, status_result
+from .result import ProbeResult
+from .trace import Trace
+from .resolver import RESOLVER
+
+DEFAULT_CONCURRENCY = 64
+
+
+# Socket timeouts track the same Deadline as wait_for(), so sockets of a probe
+# that is being cancelled do not outlive it.
+async def _ping(api: compat.Api, server, deadline: Deadline):
+    if api.async_ping is None:
+        return None
+    try:
+        return await api.async_ping(server, deadline.remaining())
+    except Exception:
+        return None
+
+async def _probe(host: str, port: int, edition: str, deadline: Deadline, mode: str, trace: Trace) -> ProbeResult:
+    api = compat.api(edition)
+    with trace.span("resolve"):
+        endpoint, dns_ms = RESOLVER.peek(edition, host, port), 0.0
+        if endpoint is None:    # dnspython is blocking; keep cold lookups off the event loop
+            endpoint, dns_ms = await asyncio.to_thread(RESOLVER.resolve, edition, host, port, deadline.remaining())
+    server = api.connect(endpoint, deadline.remaining())
+    if hasattr(server, "trace"):
+        server.trace = trace
+    with trace.span("status"):
+        stat, latency = await api.async_status(server, deadline.remaining())
+    with trace.span("motd"):
+        result = status_result(stat, latency, edition, dns_ms)
+    if mode == "full":
+        with trace.span("ping"):
+            result = result._replace(ping_ms=await _ping(api, server, deadline))
+    return result
+
+async def async_check_status(host: str, port: int, edition: str, timeout_ms: int, mode: str = "fast") -> ProbeResult:
+    """Asyncio twin of :func:`mcstat.probe.check_status`; the deadline covers the whole probe."""
+    trace = Trace()
+    secs = max(0.1, timeout_ms / 1000.0)
+    try:
+        result = await asyncio.wait_for(_probe(host, port, edition, Deadline(secs), mode, trace), secs)
+    except (asyncio.TimeoutError, TimeoutError):
+        result = error_result(TimeoutError(), f"timed out after {secs:g} s")
+    except Exception as e:
+        result = error_result(e)
+    return finish(trace, (edition, host, port), result)
+
+async def check_target(target, timeout_ms: int, mode: str = "fast", policy=None) -> ProbeResult:
+    """Probe one ``(edition, host, port)``: Auto targets race both editions, others use ``policy`` if given."""
+    edition, host, port = target
+    if edition == "Auto":
+        from .detect import DETECTOR
+        return await DETECTOR.async_check(host, port, timeout_ms, mode,
+                                          policy.async_check if policy is not None else None)
+    if policy is not None:
+        return await policy.async_check(host, port, edition, timeout_ms, mode)
+    return await async_check_status(host, port, edition, timeout_ms, mode)
+
+async def sweep(targets, timeout_ms: int, concurrency: int = DEFAULT_CONCURRENCY, mode: str = "fast",
+                policy=None):
+    """Yield ``(target, result)`` for each ``(edition, host, port)`` as soon as it completes.
+
+    With an :class:`~mcstat.policy.AdaptivePolicy`, ``timeout_ms`` is each target's total budget
+    and the policy decides how it is split into attempts.
+    """
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(target):
+        async with sem:
+            return target, await check_target(target, timeout_ms, mode, policy)
+
+    tasks = [asyncio.ensure_future(one(t)) for t in targets]
+    try:
+        for fut in asyncio.as_completed(tasks):
+            yield await fut
+    finally:
+        for task in tasks:
+            task.cancel()
+
+def sweep_all(targets, timeout_ms: int, concurrency: int = DEFAULT_CONCURRENCY, mode: str = "fast") -> dict:
+    """Blocking wrapper around :func:`sweep` that returns ``{target: result}``."""
+    async def collect():
+        return {target: result async for target, result in sweep(targets, timeout_ms, concurrency, mode)}
+    return asyncio.run(collect())
@@ -0,0 +1,100 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class _Flight:
+    """One in-progress probe that other callers can wait on."""
+    __slots__ = ("event", "value", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class ResultCache:
+    """Process-wide TTL cache with LRU eviction and single-flight probes.
+
+    Keys are ``(edition, host, port)`` tuples. Concurrent misses for the same
+    key share one probe: the first caller runs it, the rest wait for its result.
+    """
+
+    def __init__(self, ttl: float = 30.0, maxsize: int = 512):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries: OrderedDict = OrderedDict()   # key -> (stored_at, value)
+        self._inflight: dict = {}
+        self._listeners: list = []
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def get(self, key, probe, max_age: float | None = None):
+        """Return the cached value for ``key`` or run ``probe()`` once to fill it.
+
+        ``max_age`` tightens the TTL for this call only, so a caller that wants a
+        fresh result still coalesces with a probe that has only just finished.
+        """
+        return self.get_aged(key, probe, max_age)[0]
+
+    def get_aged(self, key, probe, max_age: float | None = None) -> tuple:
+        """Like :meth:`get` but returns ``(value, seconds since its probe finished)``."""
+        ttl = self.ttl if max_age is None else min(self.ttl, max_age)
+        with self._lock:
+            entry = self._entries.get(key)
+            age = time.monotonic() - entry[0] if entry is not None else None
+            if age is not None and age < ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1], age
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value, 0.0
+
+        try:
+            flight.value = probe()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                if flight.error is None:
+                    self._store(key, flight.value)
+                del self._inflight[key]
+            flight.event.set()
+        for listener in self._listeners:
+            listener(key, flight.value)
+        return flight.value, 0.0
+
+    def _store(self, key, value):
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def subscribe(self, listener):
+        """Call ``listener(key, value)`` after every real probe (never on hits)."""
+        self._listeners.append(listener)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits, "misses": self.misses, "coalesced": self.coalesced,
+                "size": len(self._entries),
+            }
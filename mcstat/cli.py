@@ -0,0 +1,124 @@
+"""Headless status checks: ``python -m mcstat host[:port] ...``.
+
+Prints one JSON document (``--format json``), one JSON object per line as
+results arrive (``ndjson``) or a human-readable line per target (``text``).
+Exits 0 when every target is up, 1 when any is down, 2 on bad arguments.
+Nothing on this path imports Streamlit.
+"""
+import argparse
+import json
+import sys
+import time
+
+from . import targets as target_list
+from .policy import AdaptivePolicy
+from .probe import DEFAULT_TIMEOUT_MS, PROBE_MODES
+
+
+def _parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(prog="python -m mcstat", description="Check Minecraft server status.")
+    p.add_argument("targets", nargs="*", metavar="TARGET",
+                   help="host, host:port, bedrock://host:port, auto://host or host,port,edition")
+    p.add_argument("-f", "--file", action="append", default=[],
+                   help="read targets from a .txt/.csv/.toml file ('-' for stdin)")
+    p.add_argument("-e", "--edition", choices=["Java", "Bedrock", "Auto"], default="Java",
+                   help="edition for targets that do not name one (default: Java; Auto races both)")
+    p.add_argument("-t", "--timeout", type=int, default=DEFAULT_TIMEOUT_MS, metavar="MS",
+                   help=f"per-target time budget in ms, retries included (default: {DEFAULT_TIMEOUT_MS})")
+    p.add_argument("-m", "--mode", choices=PROBE_MODES, default="fast",
+                   help="'full' adds a separate ping round-trip")
+    p.add_argument("-c", "--concurrency", type=int, default=64,
+                   help="targets probed at once when checking several (default: 64, per process with -p)")
+    p.add_argument("-p", "--processes", type=int, default=0, metavar="N",
+                   help="shard sweeps of several targets across N worker processes (default: 0, in-process)")
+    p.add_argument("-r", "--retries", type=int, default=2, metavar="N",
+                   help="Bedrock retries within the timeout after a lost reply (default: 2; 0 disables)")
+    p.add_argument("--format", choices=["json", "ndjson", "text"], default="json")
+    p.add_argument("--timings", action="store_true", help="report startup and sweep time on stderr")
+    p.add_argument("--trace", metavar="FILE", help="append per-phase spans of every probe to FILE (OTLP/JSON lines)")
+    return p
+
+def _load_targets(args, parser) -> list:
+    found = []
+    try:
+        found += [target_list.parse_target(spec, args.edition) for spec in args.targets]
+        for name in args.file:
+            if name == "-":
+                found += target_list.parse_text(sys.stdin.read())
+            else:
+                with open(name, "rb") as fh:
+                    found += target_list.load(name, fh.read())
+    except (ValueError, OSError) as e:
+        parser.error(str(e))
+    if not found:
+        parser.error("no targets given")
+    return list(dict.fromkeys(found))
+
+def _record(target, result) -> dict:
+    return {"target": target_list.format_target(target), **result.as_dict()}
+
+def _text_line(target, result) -> str:
+    name = target_list.format_target(target)
+    if not result.up:
+        return f"DOWN {name}  {result.error or 'unreachable'}"
+    detected = f"  [{'+'.join(result.editions)}]" if result.editions else ""
+    return (f"UP   {name}  {int(result.latency_ms or 0)} ms  "
+            f"{result.players_online or 0}/{result.players_max or '?'}  {result.version or ''}{detected}")
+
+def _emit(target, result, fmt: str):
+    if fmt == "ndjson":
+        print(json.dumps(_record(target, result), default=str), flush=True)
+    elif fmt == "text":
+        print(_text_line(target, result), flush=True)
+
+def _run(targets, args, on_result):
+    """One target is probed inline; several go through the asyncio engine or, with -p, the process farm."""
+    if len(targets) > 1 and args.processes > 0:
+        from .farm import farm_sweep
+        for target, result in farm_sweep(targets, args.timeout, args.processes, args.concurrency, args.mode,
+                                         args.retries, args.trace):
+            on_result(target, result)
+        return
+    policy = AdaptivePolicy(udp_retries=args.retries)
+    if len(targets) == 1:
+        edition, host, port = targets[0]
+        if edition == "Auto":
+            from .detect import DETECTOR
+            result = DETECTOR.check(host, port, args.timeout, args.mode, policy.check)
+        else:
+            result = policy.check(host, port, edition, args.timeout, args.mode)
+        on_result(targets[0], result)
+        return
+    import asyncio
+    from .aio import sweep
+
+    async def collect():
+        async for target, result in sweep(targets, args.timeout, args.concurrency, args.mode, policy):
+            on_result(target, result)
+    asyncio.run(collect())
+
+def main(argv=None, t0: float | None = None) -> int:
+    parser = _parser()
+    args = parser.parse_args(argv)
+    targets = _load_targets(args, parser)
+    if args.trace:
+        from .trace import JsonlExporter, set_exporter
+        set_exporter(JsonlExporter(args.trace))
+    started = time.perf_counter()
+
+    results = {}
+
+    def on_result(target, result):
+        results[target] = result
+        _emit(target, result, args.format)
+
+    _run(targets, args, on_result)
+    if args.format == "json":
+        records = [_record(t, results[t]) for t in targets]
+        print(json.dumps(records[0] if len(records) == 1 else records, indent=2, default=str))
+
+    if args.timings:
+        if t0 is not None:
+            print(f"startup: {(started - t0) * 1000:.1f} ms", file=sys.stderr)
+        print(f"sweep: {len(targets)} targets in {(time.perf_counter() - started) * 1000:.1f} ms", file=sys.stderr)
+    return 0 if all(r.up for r in results.values()) else 1
@@ -0,0 +1,129 @@
+"""mcstatus compatibility layer, resolved once per edition on first use.
+
+The installed mcstatus is inspected a single time and each operation is bound
+to a plain function with a fixed ``(…, secs)`` signature, so the probe engines
+never discover the API by catching TypeError on the hot path (which would also
+swallow genuine TypeErrors raised inside the library).
+
+Nothing here imports mcstatus until an edition is first probed, which keeps
+``import mcstat.probe`` (and the CLI's startup) cheap.
+"""
+import functools
+import time
+from typing import Callable, NamedTuple
+
+
+class Api(NamedTuple):
+    """Bound probe operations for one edition; ``None`` where unsupported."""
+    connect: Callable           # (endpoint, secs) -> server, no further DNS
+    status: Callable            # (server, secs) -> (status response, latency ms)
+    ping: Callable | None       # (server, secs) -> latency ms
+    query: Callable | None      # (server, secs) -> query response
+    async_status: Callable
+    async_ping: Callable | None
+
+
+@functools.cache
+def mcstatus_version() -> str | None:
+    from importlib import metadata
+    try:
+        return metadata.version("mcstatus")
+    except metadata.PackageNotFoundError:
+        return None
+
+def _params(fn) -> frozenset:
+    """Parameters of ``fn`` and of whatever it wraps.
+
+    mcstatus decorates ``status``/``ping`` with ``@retry(tries=3)``, whose wrapper
+    takes ``tries`` and ``functools.wraps`` the original; ``inspect.signature``
+    would follow ``__wrapped__`` and only see the inner ``(self, **kwargs)``.
+    """
+    import inspect
+    found = set()
+    for follow in (False, True):
+        try:
+            found.update(inspect.signature(fn, follow_wrapped=follow).parameters)
+        except (TypeError, ValueError):
+            pass
+    return frozenset(found)
+
+def _latency(stat, start: float) -> float:
+    """Latency mcstatus measured for this exchange, else our own clock around it.
+
+    ``is None`` rather than ``or``: a legitimate 0.0 must not count as missing.
+    """
+    latency = getattr(stat, "latency", None)
+    return latency if latency is not None else (time.perf_counter() - start) * 1000.0
+
+def _bind_call(cls, name: str):
+    """Bind ``server.<name>()`` as a single attempt bounded by ``secs``."""
+    fn = getattr(cls, name, None)
+    if fn is None:
+        return None
+    kwargs = {"tries": 1} if "tries" in _params(fn) else {}
+    # Timeouts live on the server instance (one per probe); never on the socket module
+    if name == "status":
+        def call(server, secs):
+            server.timeout = secs
+            start = time.perf_counter()
+            stat = server.status(**kwargs)
+            return stat, _latency(stat, start)
+    else:
+        def call(server, secs):
+            server.timeout = secs
+            return getattr(server, name)(**kwargs)
+    return call
+
+def _bind_async(cls, name: str, sync):
+    """Native ``async_<name>`` when present, else the sync binding in a worker thread."""
+    if sync is None:
+        return None
+    fn = getattr(cls, f"async_{name}", None)
+    if fn is None:
+        import asyncio
+        return lambda *args: asyncio.to_thread(sync, *args)
+    kwargs = {"tries": 1} if "tries" in _params(fn) else {}
+
+    if name == "status":
+        async def call(server, secs):
+            server.timeout = secs
+            start = time.perf_counter()
+            stat = await server.async_status(**kwargs)
+            return stat, _latency(stat, start)
+    else:
+        async def call(server, secs):
+            server.timeout = secs
+            return await getattr(server, f"async_{name}")(**kwargs)
+    return call
+
+def _bind(cls, connect) -> Api:
+    status = _bind_call(cls, "status")
+    ping = _bind_call(cls, "ping")
+    return Api(
+        connect=connect,
+        status=status,
+        ping=ping,
+        query=_bind_call(cls, "query"),
+        async_status=_bind_async(cls, "status", status),
+        async_ping=_bind_async(cls, "ping", ping),
+    )
+
+@functools.cache
+def _java() -> Api:
+    from mcstatus import JavaServer
+    try:
+        # Connect to the cached IP while still sending the host name in the
+        # handshake (shared-IP hosts and proxies route on it)
+        from ._pinned import PinnedJavaServer
+    except ImportError:
+        return _bind(JavaServer, lambda endpoint, secs: JavaServer(endpoint.host, endpoint.port, timeout=secs))
+    return _bind(JavaServer, PinnedJavaServer)
+
+@functools.cache
+def _bedrock() -> Api:
+    from mcstatus import BedrockServer
+    # No host name on the wire, so always connect straight to the IP
+    return _bind(BedrockServer, lambda endpoint, secs: BedrockServer(endpoint.ip, endpoint.port, timeout=secs))
+
+def api(edition: str) -> Api:
+    return _bedrock() if edition == "Bedrock" else _java()
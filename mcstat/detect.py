@@ -0,0 +1,124 @@
+"""Edition auto-detection: race Java and Bedrock, remember who answered.
+
+An ``("Auto", host, port)`` target fires the Java status (TCP) and the Bedrock
+ping (UDP) at once and returns the first UP result; if the other edition also
+answers within ``hybrid_grace_ms`` the host is a hybrid (e.g. Geyser) and both
+are reported. Port ``0`` means each edition's default (25565 / 19132).
+
+The editions that answered are cached per host for ``ttl`` seconds, so later
+checks send only the winning protocol; a DOWN from the cached edition forgets
+the host and the next check races again. Results gain ``editions`` (those that
+answered, winner first), ``detected_from`` (``"race"`` / ``"cache"``) and
+``port``.
+"""
+import queue
+import threading
+import time
+from collections import OrderedDict
+
+from .probe import check_status
+from .result import ProbeResult
+from .targets import DEFAULT_PORTS
+
+
+class EditionDetector:
+    def __init__(self, ttl: float = 3600.0, hybrid_grace_ms: float = 250.0, maxsize: int = 1024):
+        self.ttl = ttl
+        self.hybrid_grace_ms = hybrid_grace_ms
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._known: OrderedDict = OrderedDict()    # (host, port) -> (editions, expires_at)
+
+    # -------------------- Detected-edition cache --------------------
+    def known(self, host: str, port: int = 0) -> tuple | None:
+        with self._lock:
+            entry = self._known.get((host, port))
+            if entry is None or entry[1] < time.monotonic():
+                return None
+            self._known.move_to_end((host, port))
+            return entry[0]
+
+    def _remember(self, host: str, port: int, editions: tuple):
+        with self._lock:
+            self._known[host, port] = (editions, time.monotonic() + self.ttl)
+            self._known.move_to_end((host, port))
+            while len(self._known) > self.maxsize:
+                self._known.popitem(last=False)
+
+    def forget(self, host: str, port: int = 0):
+        with self._lock:
+            self._known.pop((host, port), None)
+
+    # -------------------- Probing --------------------
+    @staticmethod
+    def _legs(port: int) -> list:
+        return [(edition, port or DEFAULT_PORTS[edition]) for edition in ("Java", "Bedrock")]
+
+    def _cached(self, host: str, port: int, editions: tuple, result: ProbeResult) -> ProbeResult:
+        if not result.up:
+            self.forget(host, port)         # moved or switched edition: race again next time
+        return result._replace(editions=editions, detected_from="cache", port=port or DEFAULT_PORTS[editions[0]])
+
+    def _raced(self, host: str, port: int, answered: list, failed: list) -> ProbeResult:
+        """``answered``/``failed``: ``[(edition, port, result)]`` of finished legs in finishing order."""
+        if not answered:
+            error = "; ".join(f"{e} ({p}): {r.error or 'no answer'}" for e, p, r in failed)
+            return ProbeResult(False, error=error or "no answer from either edition",
+                               error_type=failed[-1][2].error_type if failed else "TimeoutError",
+                               port=port or None, detected_from="race")
+        editions = tuple(edition for edition, _, _ in answered)
+        self._remember(host, port, editions)
+        edition, leg_port, result = answered[0]
+        return result._replace(editions=editions, detected_from="race", port=leg_port)
+
+    def check(self, host: str, port: int, timeout_ms: int, mode: str = "fast", probe=check_status) -> ProbeResult:
+        """Probe an Auto target; ``probe`` has ``check_status``'s signature (e.g. a policy's ``check``)."""
+        editions = self.known(host, port)
+        if editions:
+            edition = editions[0]
+            return self._cached(host, port, editions,
+                                probe(host, port or DEFAULT_PORTS[edition], edition, timeout_ms, mode))
+
+        done: queue.SimpleQueue = queue.SimpleQueue()
+        for edition, leg_port in self._legs(port):
+            threading.Thread(target=lambda e=edition, p=leg_port: done.put((e, p, probe(host, p, e, timeout_ms, mode))),
+                             name="mc-detect", daemon=True).start()
+        answered, failed = [], []
+        for _ in range(2):
+            try:
+                # Once one edition is UP, the other gets only a short grace to prove a hybrid
+                leg = done.get(timeout=self.hybrid_grace_ms / 1000 if answered else None)
+            except queue.Empty:
+                break
+            (answered if leg[2].up else failed).append(leg)
+        return self._raced(host, port, answered, failed)
+
+    async def async_check(self, host: str, port: int, timeout_ms: int, mode: str = "fast", probe=None) -> ProbeResult:
+        """Asyncio twin of :meth:`check`; ``probe`` defaults to ``async_check_status``."""
+        import asyncio
+        if probe is None:
+            from .aio import async_check_status as probe
+        editions = self.known(host, port)
+        if editions:
+            edition = editions[0]
+            return self._cached(host, port, editions,
+                                await probe(host, port or DEFAULT_PORTS[edition], edition, timeout_ms, mode))
+
+        legs = {asyncio.ensure_future(probe(host, p, e, timeout_ms, mode)): (e, p) for e, p in self._legs(port)}
+        answered, failed, pending = [], [], set(legs)
+        try:
+            while pending:
+                timeout = self.hybrid_grace_ms / 1000 if answered else None
+                finished, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not finished:
+                    break
+                for task in finished:
+                    result = task.result()
+                    (answered if result.up else failed).append((*legs[task], result))
+        finally:
+            for task in pending:
+                task.cancel()
+        return self._raced(host, port, answered, failed)
+
+
+DETECTOR = EditionDetector()
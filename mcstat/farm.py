@@ -0,0 +1,157 @@
+"""Sharded sweeps: split a big target list across worker processes.
+
+One process runs every probe's JSON decoding and MOTD parsing under one GIL,
+which caps a sweep of thousands of targets at one core. :func:`farm_sweep`
+deals the targets round-robin into one shard per worker process; each worker
+probes its shard concurrently like :func:`mcstat.aio.sweep` (with its own
+resolver cache, adaptive policy and concurrency limit) and streams results
+back over a pipe in small batches of records: a ``RECORD`` header (position in
+the shard, length) and the result in :meth:`ProbeResult.to_bytes` layout. The coordinator merges
+the pipes as they become readable and yields ``(target, result)`` in
+completion order, like :func:`~mcstat.aio.sweep`::
+
+    for target, result in farm_sweep(targets, 2500, processes=4):
+        ...
+
+A worker that dies reports its unfinished targets DOWN instead of hanging
+the sweep. Workers are spawned, not forked, so they never inherit the
+caller's threads or sockets.
+"""
+import os
+import struct
+import time
+
+from .aio import DEFAULT_CONCURRENCY
+from .result import ProbeResult
+
+BATCH = 64              # records per pipe message at most
+FLUSH_S = 0.02          # ...or whatever is buffered after this long
+RECORD = struct.Struct("<II")
+
+
+def _worker(conn, shard: list, timeout_ms: int, concurrency: int, mode: str, retries: int | None,
+            batch: int, trace_path: str | None):
+    import asyncio
+    import signal
+
+    from .aio import check_target
+    from .policy import AdaptivePolicy
+
+    signal.signal(signal.SIGINT, signal.SIG_IGN)    # the coordinator decides when to stop
+    if trace_path:
+        from .trace import JsonlExporter, set_exporter
+        set_exporter(JsonlExporter(trace_path))
+    policy = AdaptivePolicy(udp_retries=retries) if retries is not None else None
+
+    async def run():
+        sem = asyncio.Semaphore(concurrency)
+        buffered, count = [], 0
+
+        def flush():
+            nonlocal count
+            if buffered:
+                conn.send_bytes(b"".join(buffered))
+                buffered.clear()
+                count = 0
+
+        async def one(pos, target):
+            nonlocal count
+            async with sem:
+                result = await check_target(target, timeout_ms, mode, policy)
+            try:
+                data = result.to_bytes()
+            except (struct.error, ValueError, OverflowError) as e:     # e.g. a field past its wire size
+                data = ProbeResult.down(e, f"result not encodable: {e}").to_bytes()
+            buffered.append(RECORD.pack(pos, len(data)))
+            buffered.append(data)
+            count += 1
+            if count >= batch:
+                flush()
+
+        async def ticker():
+            while True:
+                await asyncio.sleep(FLUSH_S)
+                flush()
+
+        tick = asyncio.ensure_future(ticker())
+        try:
+            await asyncio.gather(*(one(pos, target) for pos, target in enumerate(shard)))
+        finally:
+            tick.cancel()
+            flush()
+
+    try:
+        asyncio.run(run())
+        conn.send_bytes(b"")    # shard done
+    finally:
+        conn.close()
+
+
+def farm_sweep(targets, timeout_ms: int, processes: int | None = None, concurrency: int = DEFAULT_CONCURRENCY,
+               mode: str = "fast", retries: int | None = 2, trace_path: str | None = None, batch: int = BATCH,
+               start_method: str = "spawn"):
+    """Yield ``(target, result)`` for each of ``targets``, probed by ``processes`` workers.
+
+    ``processes`` defaults to the CPU count; ``concurrency`` applies per worker. ``retries`` sets
+    each worker's :class:`~mcstat.policy.AdaptivePolicy` (``None`` probes without one) and
+    ``trace_path`` makes every worker append its spans there.
+    """
+    import multiprocessing
+    from multiprocessing.connection import wait
+
+    from .probe import error_result
+
+    targets = list(targets)
+    if not targets:
+        return
+    processes = max(1, min(processes or os.cpu_count() or 1, len(targets)))
+    ctx = multiprocessing.get_context(start_method)
+    workers = {}    # conn -> (process, shard, positions still pending)
+    try:
+        for i in range(processes):
+            shard = targets[i::processes]
+            reader, writer = ctx.Pipe(duplex=False)
+            proc = ctx.Process(target=_worker, name=f"mcstat-farm-{i}", daemon=True,
+                               args=(writer, shard, timeout_ms, concurrency, mode, retries, batch, trace_path))
+            proc.start()
+            writer.close()
+            workers[reader] = (proc, shard, set(range(len(shard))))
+
+        while workers:
+            for conn in wait(list(workers)):
+                proc, shard, pending = workers[conn]
+                try:
+                    data = conn.recv_bytes()
+                except EOFError:
+                    data = b""
+                if data:
+                    for pos, result in _records(data):
+                        pending.discard(pos)
+                        yield shard[pos], result
+                    continue
+                del workers[conn]
+                conn.close()
+                proc.join(timeout=1.0)
+                for pos in sorted(pending):
+                    yield shard[pos], error_result(RuntimeError(), f"probe worker exited (code {proc.exitcode})")
+    finally:
+        for conn, (proc, _, _) in workers.items():
+            proc.terminate()
+            conn.close()
+        deadline = time.monotonic() + 1.0
+        for proc, _, _ in workers.values():
+            proc.join(timeout=max(0.0, deadline - time.monotonic()))
+
+
+def _records(data: bytes):
+    view, at = memoryview(data), 0
+    while at < len(view):
+        pos, size = RECORD.unpack_from(view, at)
+        at += RECORD.size
+        yield pos, ProbeResult.from_bytes(view[at:at + size])
+        at += size
+
+
+def farm_all(targets, timeout_ms: int, processes: int | None = None, **kwargs) -> dict:
+    """Blocking wrapper around :func:`farm_sweep` that returns ``{target: result}`` (last one wins for repeats)."""
+    return dict(farm_sweep(targets, timeout_ms, processes, **kwargs))
@@ -0,0 +1,270 @@
+"""Append-only probe history in SQLite (WAL mode).
+
+Samples are buffered in memory and written in batches by one writer thread.
+Tables are ``WITHOUT ROWID`` and clustered on ``(target_id, ts)``, so a range
+query for one target is a single index walk.
+
+As soon as a bucket closes, the writer pre-aggregates it into rollups
+(min/avg/max/p95 of latency and players) at every configured resolution, so a
+chart reads a bounded number of rows however long its window is. Raw samples
+are kept for ``raw_retention``; each resolution has its own retention.
+"""
+import itertools
+import math
+import sqlite3
+import threading
+import time
+from typing import NamedTuple
+
+SCHEMA_VERSION = 2
+# bucket width (s) -> retention (s); hour/day/week charts read 60/144/168 rows
+RESOLUTIONS = {60: 2 * 86400, 600: 30 * 86400, 3600: 365 * 86400}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS targets (
+    id      INTEGER PRIMARY KEY,
+    edition TEXT NOT NULL,
+    host    TEXT NOT NULL,
+    port    INTEGER NOT NULL,
+    UNIQUE (edition, host, port)
+);
+CREATE TABLE IF NOT EXISTS samples (
+    target_id INTEGER NOT NULL,
+    ts        INTEGER NOT NULL,
+    up        INTEGER NOT NULL,
+    latency   REAL,
+    online    INTEGER,
+    max       INTEGER,
+    PRIMARY KEY (target_id, ts)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS samples_ts ON samples (ts);
+CREATE TABLE IF NOT EXISTS rollups (
+    target_id  INTEGER NOT NULL,
+    bucket     INTEGER NOT NULL,
+    ts         INTEGER NOT NULL,
+    n          INTEGER NOT NULL,
+    up         INTEGER NOT NULL,
+    lat_min    REAL,
+    lat_avg    REAL,
+    lat_max    REAL,
+    lat_p95    REAL,
+    online_min INTEGER,
+    online_avg REAL,
+    online_max INTEGER,
+    online_p95 INTEGER,
+    PRIMARY KEY (target_id, bucket, ts)
+) WITHOUT ROWID;
+"""
+
+
+class Sample(NamedTuple):
+    ts: int
+    up: bool
+    latency: float | None
+    online: int | None
+    max: int | None
+
+
+class Rollup(NamedTuple):
+    ts: int             # bucket start
+    n: int
+    up: int             # samples that were up
+    lat_min: float | None
+    lat_avg: float | None
+    lat_max: float | None
+    lat_p95: float | None
+    online_min: int | None
+    online_avg: float | None
+    online_max: int | None
+    online_p95: int | None
+
+
+def _stats(values: list) -> tuple:
+    """min, avg, max, p95 (nearest rank) of the non-null values."""
+    values = sorted(v for v in values if v is not None)
+    if not values:
+        return None, None, None, None
+    p95 = values[math.ceil(0.95 * len(values)) - 1]
+    return values[0], sum(values) / len(values), values[-1], p95
+
+
+class HistoryStore:
+    def __init__(self, path: str, raw_retention: float = 2 * 86400, resolutions: dict = RESOLUTIONS,
+                 flush_every: float = 2.0, batch: int = 512, rollup_every: float = 30.0,
+                 compact_every: float = 600.0):
+        self.path = path
+        self.raw_retention = raw_retention
+        self.resolutions = dict(resolutions)
+        self.flush_every = flush_every
+        self.rollup_every = rollup_every
+        self.batch = batch
+        self.compact_every = compact_every
+        self._local = threading.local()
+        self._cond = threading.Condition()
+        self._pending: list = []
+        self._target_ids: dict = {}
+        self._stopped = False
+        with self._connect() as db:
+            if db.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                # v1 rollups had a single resolution and no p95; rebuild from raw samples
+                db.execute("DROP TABLE IF EXISTS rollups")
+            db.executescript(_SCHEMA)
+            db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            self._rolled = {b: self._watermark(db, b) for b in self.resolutions}
+        self._thread = threading.Thread(target=self._run, name="mc-history", daemon=True)
+        self._thread.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.path, timeout=10.0)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        return db
+
+    def _db(self) -> sqlite3.Connection:
+        """This thread's connection (sqlite3 connections are not shared across threads)."""
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = self._local.db = self._connect()
+        return db
+
+    # -------------------- Writes --------------------
+    def record(self, key, result, ts: float | None = None):
+        """Queue one :class:`~mcstat.result.ProbeResult`; matches the ResultCache listener signature."""
+        row = (key, int(ts if ts is not None else time.time()), 1 if result.up else 0,
+               result.latency_ms, result.players_online, result.players_max)
+        with self._cond:
+            self._pending.append(row)
+            if len(self._pending) >= self.batch:
+                self._cond.notify()
+
+    def flush(self):
+        with self._cond:
+            rows, self._pending = self._pending, []
+        if rows:
+            self._write(self._db(), rows)
+
+    def close(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        self._thread.join()
+
+    def _target_id(self, db: sqlite3.Connection, key) -> int:
+        tid = self._target_ids.get(key)
+        if tid is None:
+            db.execute("INSERT OR IGNORE INTO targets (edition, host, port) VALUES (?, ?, ?)", key)
+            tid = db.execute("SELECT id FROM targets WHERE edition = ? AND host = ? AND port = ?", key).fetchone()[0]
+            self._target_ids[key] = tid
+        return tid
+
+    def _write(self, db: sqlite3.Connection, rows):
+        with db:
+            db.executemany(
+                "INSERT OR REPLACE INTO samples (target_id, ts, up, latency, online, max) VALUES (?, ?, ?, ?, ?, ?)",
+                [(self._target_id(db, key), *rest) for key, *rest in rows],
+            )
+
+    def _run(self):
+        db = self._db()
+        next_rollup = time.monotonic() + self.rollup_every
+        next_compact = time.monotonic() + self.compact_every
+        while True:
+            with self._cond:
+                if not self._stopped and len(self._pending) < self.batch:
+                    self._cond.wait(self.flush_every)
+                rows, self._pending = self._pending, []
+                stopped = self._stopped
+            if rows:
+                self._write(db, rows)
+            if time.monotonic() >= next_rollup:
+                self.roll_up()
+                next_rollup = time.monotonic() + self.rollup_every
+            if time.monotonic() >= next_compact:
+                self.compact()
+                next_compact = time.monotonic() + self.compact_every
+            if stopped:
+                db.close()
+                return
+
+    # -------------------- Rollups & retention --------------------
+    @staticmethod
+    def _watermark(db: sqlite3.Connection, bucket: int) -> int | None:
+        """Start of the first bucket not rolled up yet (None: nothing recorded)."""
+        row = db.execute("SELECT max(ts) FROM rollups WHERE bucket = ?", (bucket,)).fetchone()
+        if row[0] is not None:
+            return row[0] + bucket
+        row = db.execute("SELECT min(ts) FROM samples").fetchone()
+        return row[0] // bucket * bucket if row[0] is not None else None
+
+    def roll_up(self, now: float | None = None):
+        """Aggregate every bucket that has closed since the last call."""
+        now = time.time() if now is None else now
+        # Allow for rows still sitting in the write buffer
+        closed = int(now - 2 * self.flush_every - 1)
+        db = self._db()
+        for bucket, start in self._rolled.items():
+            if start is None:
+                start = self._watermark(db, bucket)
+                if start is None:
+                    continue
+            end = closed // bucket * bucket
+            if end <= start:
+                self._rolled[bucket] = start
+                continue
+            rows = db.execute(
+                "SELECT target_id, ts, up, latency, online FROM samples "
+                "WHERE ts >= ? AND ts < ? ORDER BY target_id, ts", (start, end))
+            out = []
+            for (tid, ts), group in itertools.groupby(rows, key=lambda r: (r[0], r[1] // bucket * bucket)):
+                group = list(group)
+                out.append((tid, bucket, ts, len(group), sum(r[2] for r in group),
+                            *_stats([r[3] for r in group]), *_stats([r[4] for r in group])))
+            with db:
+                db.executemany("INSERT OR REPLACE INTO rollups VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", out)
+            self._rolled[bucket] = end
+
+    def compact(self, now: float | None = None):
+        """Drop raw samples and rollups past their retention."""
+        now = time.time() if now is None else now
+        self.roll_up(now)
+        db = self._db()
+        with db:
+            db.execute("DELETE FROM samples WHERE ts < ?", (int(now - self.raw_retention),))
+            for bucket, retention in self.resolutions.items():
+                db.execute("DELETE FROM rollups WHERE bucket = ? AND ts < ?", (bucket, int(now - retention)))
+
+    # -------------------- Reads --------------------
+    def _lookup_id(self, key) -> int | None:
+        row = self._db().execute(
+            "SELECT id FROM targets WHERE edition = ? AND host = ? AND port = ?", key).fetchone()
+        return row[0] if row else None
+
+    def samples(self, key, since: float, until: float | None = None):
+        """Iterate raw samples for ``key`` in ``[since, until)``, oldest first."""
+        tid = self._lookup_id(key)
+        if tid is None:
+            return
+        cur = self._db().execute(
+            "SELECT ts, up, latency, online, max FROM samples WHERE target_id = ? AND ts >= ? AND ts < ? ORDER BY ts",
+            (tid, int(since), int(until if until is not None else time.time() + 1)),
+        )
+        for ts, up, latency, online, maxp in cur:
+            yield Sample(ts, bool(up), latency, online, maxp)
+
+    def resolution_for(self, span: float, max_points: int = 200) -> int:
+        """Finest configured bucket that covers ``span`` seconds in at most ``max_points`` rows."""
+        fitting = [b for b in sorted(self.resolutions) if span / b <= max_points]
+        return fitting[0] if fitting else max(self.resolutions)
+
+    def rollups(self, key, bucket: int, since: float, until: float | None = None):
+        """Iterate ``bucket``-second rollups for ``key`` starting in ``[since, until)``, oldest first."""
+        tid = self._lookup_id(key)
+        if tid is None:
+            return
+        cur = self._db().execute(
+            "SELECT ts, n, up, lat_min, lat_avg, lat_max, lat_p95, online_min, online_avg, online_max, online_p95 "
+            "FROM rollups WHERE target_id = ? AND bucket = ? AND ts >= ? AND ts < ? ORDER BY ts",
+            (tid, bucket, int(since), int(until if until is not None else time.time() + 1)),
+        )
+        for row in cur:
+            yield Rollup(*row)
@@ -0,0 +1,192 @@
+"""Prometheus metrics for probe results, served by a small stdlib HTTP thread.
+
+``Metrics.observe`` is a :meth:`ResultCache.subscribe` listener, so it sees
+each real probe exactly once (the background poller's included) and a scrape
+only reads what is already in memory; it never triggers a probe::
+
+    metrics = Metrics(cache=cache)
+    cache.subscribe(metrics.observe)
+    metrics.serve("127.0.0.1", 9108)      # GET /metrics
+
+Per target (``edition``, ``host``, ``port`` labels): up, players online/max,
+last DNS time and last check time gauges; status-latency and probe-duration
+histograms; probe and error counters, errors labelled by exception class; the
+adaptive policy's chosen timeout, retries and retry-recovered probes.
+Cache counters and the hit ratio come from ``cache.stats()`` at scrape time.
+"""
+import bisect
+import threading
+import time
+from collections import Counter, OrderedDict
+
+# Upper bounds in seconds; +Inf is implicit
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class _Histogram:
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: tuple):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def lines(self, name: str, labels: str) -> list:
+        out, running = [], 0
+        for bound, n in zip((*self.bounds, "+Inf"), self.counts):
+            running += n
+            out.append(f'{name}_bucket{{{labels},le="{bound}"}} {running}')
+        out.append(f"{name}_sum{{{labels}}} {self.sum:.6f}")
+        out.append(f"{name}_count{{{labels}}} {self.count}")
+        return out
+
+
+class _Target:
+    __slots__ = ("up", "online", "max", "dns", "checked_at", "probes", "retries", "recovered", "timeout",
+                 "latency", "duration")
+
+    def __init__(self, bounds: tuple):
+        self.up = 0
+        self.online = self.max = self.dns = self.timeout = None
+        self.checked_at = 0.0
+        self.probes = self.retries = self.recovered = 0
+        self.latency = _Histogram(bounds)
+        self.duration = _Histogram(bounds)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _labels(key) -> str:
+    edition, host, port = key
+    return f'edition="{_escape(edition)}",host="{_escape(host)}",port="{port}"'
+
+
+class Metrics:
+    """In-memory metric state for up to ``maxsize`` targets (least recently probed dropped first)."""
+
+    def __init__(self, cache=None, buckets: tuple = LATENCY_BUCKETS, maxsize: int = 512):
+        self.cache = cache
+        self.buckets = buckets
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._targets: OrderedDict = OrderedDict()   # key -> _Target
+        self._errors: Counter = Counter()            # (key, error class) -> count
+        self._server = None
+
+    def observe(self, key, result):
+        """Fold one probe result in; signature matches ``ResultCache.subscribe``."""
+        with self._lock:
+            t = self._targets.get(key)
+            if t is None:
+                t = self._targets[key] = _Target(self.buckets)
+                while len(self._targets) > self.maxsize:
+                    dropped = self._targets.popitem(last=False)[0]
+                    for err in [e for e in self._errors if e[0] == dropped]:
+                        del self._errors[err]
+            self._targets.move_to_end(key)
+            t.probes += 1
+            t.checked_at = time.time()
+            t.up = 1 if result.up else 0
+            t.retries += result.attempts - 1
+            t.recovered += 1 if t.up and result.attempts > 1 else 0
+            if result.timeout_ms is not None:
+                t.timeout = result.timeout_ms
+            if result.duration_ms is not None:
+                t.duration.observe(result.duration_ms / 1000)
+            if t.up:
+                t.online, t.max = result.players_online, result.players_max
+                t.dns = result.dns_ms
+                if result.latency_ms is not None:
+                    t.latency.observe(result.latency_ms / 1000)
+            else:
+                self._errors[key, result.error_type or "Unknown"] += 1
+
+    def render(self) -> str:
+        """The current state in the Prometheus text exposition format."""
+        lines = []
+
+        def family(name, kind, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(samples)
+
+        with self._lock:
+            targets = [(_labels(k), t) for k, t in self._targets.items()]
+            errors = [(f'{_labels(k)},error="{_escape(err)}"', n) for (k, err), n in self._errors.items()]
+            family("mcstat_up", "gauge", "1 if the last probe reached the server.",
+                   [f"mcstat_up{{{lb}}} {t.up}" for lb, t in targets])
+            family("mcstat_players_online", "gauge", "Players online at the last successful probe.",
+                   [f"mcstat_players_online{{{lb}}} {t.online}" for lb, t in targets if t.online is not None])
+            family("mcstat_players_max", "gauge", "Player slots at the last successful probe.",
+                   [f"mcstat_players_max{{{lb}}} {t.max}" for lb, t in targets if t.max is not None])
+            family("mcstat_dns_seconds", "gauge", "Name resolution time of the last successful probe (0 when cached).",
+                   [f"mcstat_dns_seconds{{{lb}}} {t.dns / 1000:.6f}" for lb, t in targets if t.dns is not None])
+            family("mcstat_last_check_timestamp_seconds", "gauge", "Unix time of the last probe.",
+                   [f"mcstat_last_check_timestamp_seconds{{{lb}}} {t.checked_at:.3f}" for lb, t in targets])
+            family("mcstat_latency_seconds", "histogram", "Status round-trip time of successful probes.",
+                   [line for lb, t in targets for line in t.latency.lines("mcstat_latency_seconds", lb)])
+            family("mcstat_probe_duration_seconds", "histogram", "Wall time of whole probes, DNS and failures included.",
+                   [line for lb, t in targets for line in t.duration.lines("mcstat_probe_duration_seconds", lb)])
+            family("mcstat_probes_total", "counter", "Probes run.",
+                   [f"mcstat_probes_total{{{lb}}} {t.probes}" for lb, t in targets])
+            family("mcstat_probe_timeout_seconds", "gauge", "First-attempt timeout the adaptive policy chose last.",
+                   [f"mcstat_probe_timeout_seconds{{{lb}}} {t.timeout / 1000:.6f}" for lb, t in targets
+                    if t.timeout is not None])
+            family("mcstat_probe_retries_total", "counter", "Extra attempts after a timed-out one.",
+                   [f"mcstat_probe_retries_total{{{lb}}} {t.retries}" for lb, t in targets])
+            family("mcstat_probe_recovered_total", "counter", "Probes that were UP only thanks to a retry.",
+                   [f"mcstat_probe_recovered_total{{{lb}}} {t.recovered}" for lb, t in targets])
+            family("mcstat_probe_errors_total", "counter", "Failed probes by exception class.",
+                   [f"mcstat_probe_errors_total{{{lb}}} {n}" for lb, n in errors])
+
+        if self.cache is not None:
+            stats = self.cache.stats()
+            served = stats["hits"] + stats["misses"] + stats["coalesced"]
+            for name in ("hits", "misses", "coalesced"):
+                family(f"mcstat_cache_{name}_total", "counter", f"Result cache {name}.",
+                       [f"mcstat_cache_{name}_total {stats[name]}"])
+            family("mcstat_cache_hit_ratio", "gauge", "Share of lookups answered without a new probe.",
+                   [f"mcstat_cache_hit_ratio {(served - stats['misses']) / served if served else 0:.6f}"])
+            family("mcstat_cache_entries", "gauge", "Targets held in the result cache.",
+                   [f"mcstat_cache_entries {stats['size']}"])
+        return "\n".join(lines) + "\n"
+
+    def serve(self, host: str = "127.0.0.1", port: int = 9108):
+        """Serve ``GET /metrics`` from a daemon thread; raises ``OSError`` if the port is taken."""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="mcstat-metrics", daemon=True).start()
+        return self._server
+
+    def close(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
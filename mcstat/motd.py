@@ -0,0 +1,167 @@
+"""MOTD parsing: raw description -> styled spans, plain text and HTML.
+
+Java servers send the description as a chat component (a string, a dict with
+``text``/``color``/``extra``…, or a list); Bedrock sends a string with legacy
+``§`` codes, which also turn up inside Java components. :func:`parse` walks
+either form once into a tuple of :class:`Span` and derives the plain text from
+the same walk. Servers repeat their MOTD on every probe, so parses are cached
+per distinct raw MOTD.
+"""
+import functools
+import html
+import marshal
+import re
+from typing import NamedTuple
+
+# Style flags (Span.flags bitmask)
+BOLD, ITALIC, UNDERLINED, STRIKETHROUGH, OBFUSCATED = 1, 2, 4, 8, 16
+_FLAG_KEYS = (("bold", BOLD), ("italic", ITALIC), ("underlined", UNDERLINED),
+              ("strikethrough", STRIKETHROUGH), ("obfuscated", OBFUSCATED))
+_FLAG_CODES = {"l": BOLD, "o": ITALIC, "n": UNDERLINED, "m": STRIKETHROUGH, "k": OBFUSCATED}
+
+COLORS = {
+    "black": "#000000", "dark_blue": "#0000AA", "dark_green": "#00AA00", "dark_aqua": "#00AAAA",
+    "dark_red": "#AA0000", "dark_purple": "#AA00AA", "gold": "#FFAA00", "gray": "#AAAAAA",
+    "dark_gray": "#555555", "blue": "#5555FF", "green": "#55FF55", "aqua": "#55FFFF",
+    "red": "#FF5555", "light_purple": "#FF55FF", "yellow": "#FFFF55", "white": "#FFFFFF",
+}
+_CODE_COLORS = dict(zip("0123456789abcdef", COLORS.values()))
+
+CACHE_SIZE = 2048
+CACHE_MAX_LEN = 1024            # longer (pathological) MOTDs are parsed but not kept
+
+
+class Span(NamedTuple):
+    text: str
+    color: str | None           # "#RRGGBB"
+    flags: int                  # BOLD | ITALIC | …
+
+
+class Motd(NamedTuple):
+    spans: tuple
+    plain: str                  # codes stripped, whitespace collapsed
+
+
+# -------------------- Parsing --------------------
+# One split gives [text, code, text, code, …]; a code is one character or x§r§r§g§g§b§b
+_LEGACY = re.compile(r"[§&]([0-9a-fk-orA-FK-OR]|(?<=§)x(?:§[0-9a-fA-F]){6})")
+# Colour codes and r set the colour and clear formatting; formatting codes add a flag. Either case.
+_RESETS = {c: color for code, color in (*_CODE_COLORS.items(), ("r", None)) for c in (code, code.upper())}
+_FLAG_BITS = {c: bit for code, bit in _FLAG_CODES.items() for c in (code, code.upper())}
+_new = tuple.__new__                                # NamedTuple construction without the Python-level __new__
+
+def _legacy(parts: list, color, flags: int, out: list):
+    """Append the runs of a split string to ``out``, starting from the inherited style; same-style runs merge."""
+    it = iter(parts)
+    seg = next(it)
+    last = out[-1] if out else None
+    for code, after in zip(it, it):
+        if seg:
+            if last is not None and last[2] == flags and last[1] == color:
+                last = out[-1] = _new(Span, (last[0] + seg, color, flags))
+            else:
+                last = _new(Span, (seg, color, flags))
+                out.append(last)
+        if code in _RESETS:
+            color, flags = _RESETS[code], 0
+        elif code in _FLAG_BITS:
+            flags |= _FLAG_BITS[code]
+        else:                                       # x§r§r§g§g§b§b
+            color, flags = "#" + code[2::2].upper(), 0
+        seg = after
+    if seg:
+        if last is not None and last[2] == flags and last[1] == color:
+            out[-1] = _new(Span, (last[0] + seg, color, flags))
+        else:
+            out.append(_new(Span, (seg, color, flags)))
+
+def _text(text: str, color, flags: int, out: list):
+    _legacy(_LEGACY.split(text) if "§" in text or "&" in text else [text], color, flags, out)
+
+_HEX_COLOR = re.compile(r"#[0-9A-Fa-f]{6}")
+
+def _color(value, inherited):
+    if not isinstance(value, str):
+        return inherited
+    if _HEX_COLOR.fullmatch(value):
+        return value.upper()
+    return COLORS.get(value, inherited)
+
+def _walk(node, color, flags: int, out: list):
+    if isinstance(node, str):
+        _text(node, color, flags, out)
+    elif isinstance(node, dict):
+        color = _color(node.get("color"), color)
+        for key, bit in _FLAG_KEYS:
+            if key in node:
+                flags = flags | bit if node[key] else flags & ~bit
+        text = node["text"] if "text" in node else node.get("translate", "")
+        if text != "":
+            _text(text if isinstance(text, str) else str(text), color, flags, out)
+        for child in node.get("extra") or ():
+            _walk(child, color, flags, out)
+    elif isinstance(node, list):
+        if not node:
+            return
+        # [parent, *children]: children inherit the first element's style
+        head = node[0]
+        if isinstance(head, dict):
+            _walk({**head, "extra": [*(head.get("extra") or ()), *node[1:]]}, color, flags, out)
+        else:
+            for child in node:
+                _walk(child, color, flags, out)
+    elif node is not None:
+        _text(str(node), color, flags, out)
+
+def _build(raw) -> Motd:
+    out: list = []
+    if isinstance(raw, str):                        # the plain text comes straight from the split, in C
+        if "§" not in raw and "&" not in raw:
+            return _new(Motd, ((_new(Span, (raw, None, 0)),) if raw else (), " ".join(raw.split())))
+        parts = _LEGACY.split(raw)
+        _legacy(parts, None, 0, out)
+        return _new(Motd, (tuple(out), " ".join("".join(parts[::2]).split())))
+    _walk(raw, None, 0, out)
+    return _new(Motd, (tuple(out), " ".join("".join([span[0] for span in out]).split())))
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _parse_text(text: str) -> Motd:
+    return _build(text)
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _parse_component(key: bytes) -> Motd:
+    return _build(marshal.loads(key))
+
+def parse(raw) -> Motd | None:
+    """Parse a raw MOTD (chat component, legacy string or any object) into spans + plain text."""
+    if raw is None:
+        return None
+    if isinstance(raw, (dict, list)):
+        try:    # components are unhashable; marshal is the cheapest exact key (json.dumps costs more than a parse)
+            key = marshal.dumps(raw)
+        except ValueError:                                  # not plain JSON data
+            return _build(raw)
+        return _parse_component(key) if len(key) <= CACHE_MAX_LEN else _build(raw)
+    text = raw if isinstance(raw, str) else str(raw)
+    return _parse_text(text) if len(text) <= CACHE_MAX_LEN else _build(text)
+
+
+# -------------------- Rendering --------------------
+def to_html(spans) -> str:
+    """Inline-styled HTML for ``spans``; text and attributes are escaped, newlines become ``<br>``."""
+    parts = []
+    for text, color, flags in spans:
+        text = html.escape(text).replace("\n", "<br>")
+        # Spans may come from elsewhere (e.g. ProbeResult.from_bytes): re-check the color, never trust it
+        style = [f"color:{color}"] if color and _HEX_COLOR.fullmatch(color) else []
+        if flags & BOLD:
+            style.append("font-weight:bold")
+        if flags & ITALIC:
+            style.append("font-style:italic")
+        decoration = " ".join(name for bit, name in ((UNDERLINED, "underline"), (STRIKETHROUGH, "line-through"))
+                              if flags & bit)
+        if decoration:
+            style.append(f"text-decoration:{decoration}")
+        parts.append(f'<span style="{html.escape(";".join(style))}">{text}</span>' if style else text)
+    return "".join(parts)
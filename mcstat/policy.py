@@ -0,0 +1,123 @@
+"""Adaptive per-target timeouts and bounded retries.
+
+A fixed timeout is wrong in both directions: a lost Bedrock pong (UDP, no
+retransmit) reads as DOWN after one try, and a healthy target that happens to
+stall waits out the whole budget. :class:`AdaptivePolicy` keeps a rolling
+window of each target's recent probe times and splits the caller's budget
+into attempts:
+
+* the first attempt gets ``p99 × multiplier + margin`` (clamped to
+  ``[floor_ms, budget]``) once ``min_samples`` successes are known;
+* a timed-out attempt is retried while budget is left: up to ``udp_retries``
+  times for Bedrock, once for Java (TCP already retransmits), the last attempt
+  getting whatever remains;
+* a cold Bedrock target splits the budget evenly across its attempts.
+
+Results gain ``attempts`` and ``timeout_ms`` (the first attempt's timeout) so
+:mod:`mcstat.metrics` can export the decisions.
+"""
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import NamedTuple
+
+from .probe import check_status
+from .result import ProbeResult
+
+_RETRYABLE = frozenset({"TimeoutError", "timeout"})    # no answer in time; DNS/refused are final
+
+
+class Plan(NamedTuple):
+    timeout_ms: float       # first attempt
+    attempts: int
+
+
+class AdaptivePolicy:
+    def __init__(self, multiplier: float = 2.0, margin_ms: float = 50.0, floor_ms: float = 200.0,
+                 window: int = 50, min_samples: int = 5, udp_retries: int = 2, maxsize: int = 1024):
+        self.multiplier = multiplier
+        self.margin_ms = margin_ms
+        self.floor_ms = floor_ms
+        self.window = window
+        self.min_samples = min_samples
+        self.udp_retries = udp_retries
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._samples: OrderedDict = OrderedDict()     # key -> deque of recent probe ms
+        self._p99: dict = {}
+
+    def plan(self, key, budget_ms: float) -> Plan:
+        p99 = self._p99.get(key)
+        attempts = 1 + (self.udp_retries if key[0] == "Bedrock" else 1)
+        if p99 is None:
+            if key[0] != "Bedrock":         # cold TCP target: one attempt with the full budget
+                return Plan(budget_ms, 1)
+            return Plan(max(self.floor_ms, budget_ms / attempts), attempts)
+        timeout = min(budget_ms, max(self.floor_ms, p99 * self.multiplier + self.margin_ms))
+        return Plan(timeout, attempts if timeout < budget_ms else 1)
+
+    def observe(self, key, ms: float):
+        """Record the probe time of a successful attempt."""
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self.window)
+                while len(self._samples) > self.maxsize:
+                    self._p99.pop(self._samples.popitem(last=False)[0], None)
+            self._samples.move_to_end(key)
+            samples.append(ms)
+            if len(samples) >= self.min_samples:
+                ordered = sorted(samples)
+                self._p99[key] = ordered[max(0, math.ceil(0.99 * len(ordered)) - 1)]
+
+    def _next(self, plan: Plan, attempt: int, deadline: float) -> float | None:
+        """Timeout (ms) for ``attempt`` or ``None`` when out of attempts or budget."""
+        left = (deadline - time.monotonic()) * 1000
+        if attempt >= plan.attempts or left < self.floor_ms / 2:
+            return None
+        return left if attempt == plan.attempts - 1 else min(plan.timeout_ms, left)
+
+    def _done(self, key, result: ProbeResult) -> bool:
+        if result.up:
+            self.observe(key, result.duration_ms or 0.0)
+            return True
+        return result.error_type not in _RETRYABLE
+
+    @staticmethod
+    def _stamp(result: ProbeResult, attempts: int, plan: Plan, start: float) -> ProbeResult:
+        return result._replace(attempts=attempts, timeout_ms=plan.timeout_ms,
+                               duration_ms=(time.perf_counter() - start) * 1000)    # all attempts
+
+    def check(self, host: str, port: int, edition: str, budget_ms: int, mode: str = "fast", probe=check_status) -> ProbeResult:
+        """``check_status`` under this policy; ``budget_ms`` bounds all attempts together."""
+        key = (edition, host, port)
+        plan = self.plan(key, budget_ms)
+        start, deadline = time.perf_counter(), time.monotonic() + budget_ms / 1000
+        attempt, timeout = 0, plan.timeout_ms
+        while True:
+            result = probe(host, port, edition, timeout, mode)
+            attempt += 1
+            if self._done(key, result):
+                break
+            timeout = self._next(plan, attempt, deadline)
+            if timeout is None:
+                break
+        return self._stamp(result, attempt, plan, start)
+
+    async def async_check(self, host: str, port: int, edition: str, budget_ms: int, mode: str = "fast") -> ProbeResult:
+        """Asyncio twin of :meth:`check`."""
+        from .aio import async_check_status
+        key = (edition, host, port)
+        plan = self.plan(key, budget_ms)
+        start, deadline = time.perf_counter(), time.monotonic() + budget_ms / 1000
+        attempt, timeout = 0, plan.timeout_ms
+        while True:
+            result = await async_check_status(host, port, edition, timeout, mode)
+            attempt += 1
+            if self._done(key, result):
+                break
+            timeout = self._next(plan, attempt, deadline)
+            if timeout is None:
+                break
+        return self._stamp(result, attempt, plan, start)
@@ -0,0 +1,146 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+
+from .result import ProbeResult
+
+HYSTERESIS = 0.25      # of a latency step, see signature()
+
+
+class Snapshot(NamedTuple):
+    result: ProbeResult
+    checked_at: float       # time.time() when the probe finished (not when a cache handed it over)
+
+
+def signature(result: ProbeResult, previous: tuple | None = None, latency_step: float = 25.0) -> tuple:
+    """What a viewer would notice: the result's compared fields and latency rounded to coarse steps.
+
+    Two results with the same signature render the same page, so a refresh can skip the redraw.
+    Pass the ``previous`` signature for hysteresis: latency keeps its old step until it is
+    ``HYSTERESIS`` of a step past that step's edge, so jitter around an edge is not a change.
+    """
+    latency = result.latency_ms
+    if latency is None:
+        return result, None
+    steps = latency / latency_step
+    last = previous[1] if previous is not None else None
+    if last is not None and abs(steps - last) < 0.5 + HYSTERESIS:
+        return result, last
+    return result, round(steps)
+
+
+class _Target:
+    __slots__ = ("next_due", "last_seen", "snapshot", "busy", "forced")
+
+    def __init__(self, now: float):
+        self.next_due = now
+        self.last_seen = now
+        self.snapshot = None
+        self.busy = False
+        self.forced = False
+
+
+class Poller:
+    """Background scheduler that keeps the latest result for every watched target.
+
+    Pages call ``watch(key)`` on every render and read ``latest(key)``; the probe
+    itself always runs on the poller's own threads. Targets nobody has looked at
+    for ``idle_after`` seconds are dropped.
+
+    ``probe(key, max_age)`` returns ``(result, age_s)``, e.g. :meth:`ResultCache.get_aged`:
+    scheduled polls accept a result up to ``max_age`` old, :meth:`refresh` accepts none.
+    """
+
+    def __init__(self, probe, interval: float = 30.0, idle_after: float = 300.0, workers: int = 8,
+                 max_age: float | None = None):
+        self._probe = probe
+        self.max_age = max_age
+        self.interval = interval
+        self.idle_after = idle_after
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mc-probe")
+        self._cond = threading.Condition()
+        self._targets: dict = {}
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="mc-poller", daemon=True)
+
+    def start(self) -> "Poller":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        self._pool.shutdown(wait=False)
+
+    # -------------------- Page-facing API --------------------
+    def watch(self, key):
+        now = time.monotonic()
+        with self._cond:
+            t = self._targets.get(key)
+            if t is None:
+                self._targets[key] = _Target(now)
+                self._cond.notify_all()
+            else:
+                t.last_seen = now
+
+    def refresh(self, key):
+        """Probe ``key`` as soon as possible instead of waiting for its interval."""
+        with self._cond:
+            t = self._targets.get(key)
+            if t is not None:
+                t.next_due = time.monotonic()
+                t.forced = True
+                self._cond.notify_all()
+
+    def latest(self, key) -> Snapshot | None:
+        with self._cond:
+            t = self._targets.get(key)
+            return t.snapshot if t is not None else None
+
+    def wait(self, key, timeout: float, newer_than: float = 0.0) -> Snapshot | None:
+        """Block until ``key`` has a snapshot newer than ``newer_than`` (or timeout)."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                t = self._targets.get(key)
+                snap = t.snapshot if t is not None else None
+                if snap is not None and snap.checked_at > newer_than:
+                    return snap
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return snap
+                self._cond.wait(remaining)
+
+    # -------------------- Scheduler --------------------
+    def _run(self):
+        with self._cond:
+            while not self._stopped:
+                now = time.monotonic()
+                next_wake = now + self.interval
+                for key, t in list(self._targets.items()):
+                    if now - t.last_seen > self.idle_after:
+                        del self._targets[key]
+                        continue
+                    if t.busy:
+                        continue
+                    if t.next_due <= now:
+                        t.busy = True
+                        self._pool.submit(self._poll, key, t, 0.0 if t.forced else self.max_age)
+                        t.forced = False
+                    else:
+                        next_wake = min(next_wake, t.next_due)
+                self._cond.wait(max(0.0, next_wake - now))
+
+    def _poll(self, key, t: _Target, max_age: float | None):
+        try:
+            result, age = self._probe(key, max_age)
+        except Exception as e:
+            result, age = ProbeResult.down(e), 0.0
+        with self._cond:
+            t.snapshot = Snapshot(result, time.time() - age)
+            # A refresh() that came in while this probe ran is still owed a probe of its own
+            t.next_due = time.monotonic() + (0.0 if t.forced else self.interval)
+            t.busy = False
+            self._cond.notify_all()
@@ -0,0 +1,103 @@
+import time
+
+from . import compat, motd, trace as tracing
+from .resolver import RESOLVER
+from .result import ProbeResult
+
+# -------------------- Helpers --------------------
+class Deadline:
+    """Per-probe time budget; each phase (lookup, status, ping) gets what is left.
+
+    Timeouts are applied to the server instance mcstatus builds for this probe,
+    never to process-wide socket defaults, so parallel probes cannot interfere.
+    """
+    __slots__ = ("end",)
+
+    def __init__(self, secs: float):
+        self.end = time.monotonic() + secs
+
+    def remaining(self) -> float:
+        left = self.end - time.monotonic()
+        if left <= 0:
+            raise TimeoutError("probe deadline exceeded")
+        return left
+
+def _ping_with_timeout(api: compat.Api, server, deadline: Deadline):
+    if api.ping is None:                # Bedrock has no separate ping
+        return None
+    try:
+        return api.ping(server, deadline.remaining())
+    except Exception:
+        return None
+
+def _motd(stat, attr: str) -> tuple:
+    """``(plain, spans)`` of the raw MOTD, parsed once per distinct MOTD."""
+    raw = getattr(stat, "raw", None)
+    if isinstance(raw, dict) and "description" in raw:     # Java: the chat component as sent
+        value = raw["description"]
+    else:
+        value = getattr(stat, attr, None)
+        value = getattr(value, "raw", value)                # mcstatus Motd objects keep the original
+    parsed = motd.parse(value)
+    return (parsed.plain, parsed.spans) if parsed else (None, ())
+
+def _version_name(stat) -> str | None:
+    ver_obj = getattr(stat, "version", None)
+    if ver_obj is None:
+        return None
+    return getattr(ver_obj, "name", None) or str(ver_obj)
+
+def _players(stat) -> tuple:
+    """``(online, max)``; mcstatus 11+ nests both editions under ``players``, older Bedrock kept them flat."""
+    players = getattr(stat, "players", None)
+    if players is not None:
+        return getattr(players, "online", None), getattr(players, "max", None)
+    return getattr(stat, "players_online", None), getattr(stat, "players_max", None)
+
+# -------------------- Result normalization --------------------
+# Shared by the blocking and asyncio engines so both return identical records.
+def status_result(stat, latency, edition: str, dns_ms: float) -> ProbeResult:
+    online, max_ = _players(stat)
+    plain, spans = _motd(stat, "motd" if edition == "Bedrock" else "description")
+    return ProbeResult(True, edition.lower(), online, max_, _version_name(stat), plain, spans,
+                       latency_ms=latency, dns_ms=dns_ms)
+
+def error_result(e: BaseException, message: str | None = None) -> ProbeResult:
+    """DOWN result; ``error_type`` keeps the exception class for metrics."""
+    return ProbeResult.down(e, message)
+
+# -------------------- Blocking probe --------------------
+DEFAULT_TIMEOUT_MS = 2500
+PROBE_MODES = ("fast", "full")
+
+def check_status(host: str, port: int, edition: str, timeout_ms: int, mode: str = "fast") -> ProbeResult:
+    """Probe one server. ``mode="full"`` also runs a separate ping round-trip (``ping_ms``).
+
+    ``phases`` in the result breaks the probe's wall time down per phase.
+    """
+    trace = tracing.Trace()
+    deadline = Deadline(max(0.1, timeout_ms / 1000.0))
+    try:
+        api = compat.api(edition)
+        with trace.span("resolve"):
+            endpoint, dns_ms = RESOLVER.resolve(edition, host, port, deadline.remaining())  # SRV-aware for Java
+        server = api.connect(endpoint, deadline.remaining())
+        if hasattr(server, "trace"):        # pinned Java server: connect/handshake/read sub-spans
+            server.trace = trace
+        with trace.span("status"):
+            stat, latency = api.status(server, deadline.remaining())
+        with trace.span("motd"):
+            result = status_result(stat, latency, edition, dns_ms)
+        if mode == "full":
+            with trace.span("ping"):
+                result = result._replace(ping_ms=_ping_with_timeout(api, server, deadline))
+
+    except Exception as e:
+        result = error_result(e)
+    return finish(trace, (edition, host, port), result)
+
+def finish(trace: tracing.Trace, target, result: ProbeResult) -> ProbeResult:
+    """Stamp ``duration_ms``/``phases`` on a result and hand the spans to the exporter."""
+    result = result.timed(trace.elapsed_ms(), trace.phases())
+    tracing.export(trace, target, result)
+    return result
@@ -0,0 +1,218 @@
+"""Address resolution cache with TTL honouring.
+
+Every user-entered ``(edition, host, port)`` is resolved once to an
+:class:`Endpoint` (SRV target for Java, then A/AAAA) and reused until the
+shortest record TTL runs out. Entries close to expiry are refreshed on a
+background thread while the current one keeps being served, so a probe only
+pays for DNS on a cold miss. A cold lookup stays within the probe's budget:
+each query gets what is left of it, and the OS resolver is only used for
+hosts-file names or without dnspython.
+"""
+import functools
+import ipaddress
+import os
+import socket
+import threading
+import time
+from typing import NamedTuple
+
+JAVA_DEFAULT_PORT = 25565
+
+
+class Endpoint(NamedTuple):
+    host: str       # name sent in the Java handshake (SRV target or as entered)
+    ip: str         # address actually connected to
+    port: int
+
+
+class _Entry:
+    __slots__ = ("endpoint", "expires", "ttl", "refreshing")
+
+    def __init__(self, endpoint: Endpoint, ttl: float):
+        self.endpoint = endpoint
+        self.ttl = ttl
+        self.expires = time.monotonic() + ttl
+        self.refreshing = False
+
+
+@functools.cache
+def _dns():
+    """dnspython (ships with mcstatus), imported on the first cold lookup; None if missing."""
+    try:
+        import dns.exception
+        import dns.resolver
+    except ImportError:
+        return None
+    return dns
+
+def _is_ip(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host)
+        return True
+    except ValueError:
+        return False
+
+
+class Resolver:
+    """Thread-safe resolver cache keyed by the address the user typed."""
+
+    def __init__(self, min_ttl: float = 5.0, max_ttl: float = 3600.0, fallback_ttl: float = 60.0,
+                 refresh_ahead: float = 0.2, maxsize: int = 1024):
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        self.fallback_ttl = fallback_ttl        # when the TTL is unknown (getaddrinfo, no SRV)
+        self.refresh_ahead = refresh_ahead      # refresh once this fraction of the TTL is left
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries: dict = {}
+
+    def peek(self, edition: str, host: str, port: int) -> Endpoint | None:
+        """Cached endpoint if still valid (kicking off a refresh when due), else None."""
+        if _is_ip(host):
+            return Endpoint(host, host, port)
+        key = (edition, host.lower(), port)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            left = entry.expires - time.monotonic()
+            if left <= 0:
+                return None
+            if left < entry.ttl * self.refresh_ahead and not entry.refreshing:
+                entry.refreshing = True
+                threading.Thread(target=self._refresh, args=(key,), name="mc-dns", daemon=True).start()
+            return entry.endpoint
+
+    def resolve(self, edition: str, host: str, port: int, secs: float) -> tuple[Endpoint, float]:
+        """Return ``(endpoint, resolution_ms)``; resolution_ms is 0.0 on a cache hit."""
+        endpoint = self.peek(edition, host, port)
+        if endpoint is not None:
+            return endpoint, 0.0
+        start = time.perf_counter()
+        endpoint = self._store((edition, host.lower(), port), secs)
+        return endpoint, (time.perf_counter() - start) * 1000.0
+
+    def _refresh(self, key):
+        try:
+            self._store(key, 5.0)
+        except Exception:
+            with self._lock:                # keep serving the old entry until it expires
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.refreshing = False
+
+    def _store(self, key, secs: float) -> Endpoint:
+        endpoint, ttl = self._lookup(*key, secs)
+        ttl = min(self.max_ttl, max(self.min_ttl, ttl))
+        with self._lock:
+            self._entries[key] = _Entry(endpoint, ttl)
+            if len(self._entries) > self.maxsize:
+                now = time.monotonic()
+                for k in [k for k, e in self._entries.items() if e.expires <= now]:
+                    del self._entries[k]
+                while len(self._entries) > self.maxsize:
+                    del self._entries[next(iter(self._entries))]
+        return endpoint
+
+    # -------------------- DNS --------------------
+    def _lookup(self, edition: str, host: str, port: int, secs: float) -> tuple[Endpoint, float]:
+        end = time.monotonic() + secs           # SRV and A/AAAA share the caller's budget
+        ttl = self.max_ttl
+        name = host
+        # Like the game client: a Java address without an explicit port consults SRV first
+        if edition != "Bedrock" and port == JAVA_DEFAULT_PORT and _dns() is not None and not _in_hosts(host):
+            srv = self._srv(host, _left(end))
+            if srv is not None:
+                name, port, ttl = srv
+        if _is_ip(name):
+            return Endpoint(name, name, port), ttl
+        ip, a_ttl = self._address(name, end)
+        return Endpoint(name, ip, port), min(ttl, a_ttl)
+
+    def _srv(self, host: str, secs: float):
+        dns = _dns()
+        try:
+            answer = dns.resolver.resolve(f"_minecraft._tcp.{host}", "SRV", lifetime=secs)
+        except dns.exception.DNSException:      # no SRV record (or no answer in time: A/AAAA then times out)
+            return None
+        record = min(answer, key=lambda r: (r.priority, -r.weight))
+        return str(record.target).rstrip("."), int(record.port), float(answer.rrset.ttl)
+
+    def _address(self, name: str, end: float) -> tuple[str, float]:
+        dns = _dns()
+        # /etc/hosts names, or no dnspython: the OS resolver has no TTL to offer
+        if dns is None or _in_hosts(name):
+            return _getaddrinfo(name, _left(end)), self.fallback_ttl
+        for rdtype in ("A", "AAAA"):
+            try:
+                answer = dns.resolver.resolve(name, rdtype, lifetime=_left(end))
+            except dns.resolver.NoAnswer:       # e.g. an IPv6-only name: try AAAA
+                continue
+            except dns.resolver.NXDOMAIN:
+                raise socket.gaierror(socket.EAI_NONAME, f"unknown host {name!r}") from None
+            except dns.exception.Timeout:
+                raise TimeoutError(f"DNS lookup of {name!r} timed out") from None
+            except dns.resolver.NoResolverConfiguration:
+                return _getaddrinfo(name, _left(end)), self.fallback_ttl
+            except dns.exception.DNSException as e:
+                raise socket.gaierror(socket.EAI_FAIL, f"DNS lookup of {name!r} failed: {e}") from None
+            return answer[0].to_text(), float(answer.rrset.ttl)
+        raise socket.gaierror(socket.EAI_NODATA, f"no address records for {name!r}")
+
+
+def _left(end: float) -> float:
+    left = end - time.monotonic()
+    if left <= 0:
+        raise TimeoutError("probe deadline exceeded during DNS resolution")
+    return left
+
+def _getaddrinfo(name: str, secs: float) -> str:
+    """``socket.getaddrinfo`` bounded by ``secs``; it has no timeout of its own, so it runs on a helper thread."""
+    box = []
+
+    def run():
+        try:
+            box.append(socket.getaddrinfo(name, None, type=socket.SOCK_STREAM)[0][4][0])
+        except Exception as e:
+            box.append(e)
+
+    thread = threading.Thread(target=run, name="mc-getaddrinfo", daemon=True)
+    thread.start()
+    thread.join(secs)
+    if not box:
+        raise TimeoutError(f"address lookup of {name!r} timed out")
+    if isinstance(box[0], Exception):
+        raise box[0]
+    return box[0]
+
+def _hosts_path() -> str:
+    if os.name == "nt":
+        return os.path.join(os.environ.get("SystemRoot", r"C:\Windows"), "System32", "drivers", "etc", "hosts")
+    return "/etc/hosts"
+
+_hosts_cache = (None, frozenset())      # (mtime, names)
+
+def _in_hosts(name: str) -> bool:
+    """Whether ``name`` is a local hosts-file entry (re-read when the file changes), which DNS cannot answer."""
+    global _hosts_cache
+    name = name.lower().rstrip(".")
+    if name == "localhost" or name.endswith(".localhost"):
+        return True
+    path = _hosts_path()
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        return False
+    if _hosts_cache[0] != mtime:
+        names = set()
+        try:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    names.update(n.lower() for n in line.split("#", 1)[0].split()[1:])
+        except OSError:
+            pass
+        _hosts_cache = (mtime, frozenset(names))
+    return name in _hosts_cache[1]
+
+
+RESOLVER = Resolver()
@@ -0,0 +1,201 @@
+"""The probe result record shared by every engine, cache, store and view.
+
+:class:`ProbeResult` is a flat immutable record: one tuple allocation per
+probe instead of nested dicts, attribute reads instead of ``.get`` chains,
+``_replace`` for the few wrappers that add fields (policy, edition detection).
+A DOWN probe is the same type with ``up=False`` and ``error``/``error_type``
+set (see :meth:`ProbeResult.down`), so consumers never branch on the type.
+
+Equality and hashing cover what the server reported (state, players, version,
+MOTD, error, detected editions) and ignore per-probe measurements (latency,
+DNS, durations, phases, retry decisions), so ``a == b`` means "nothing a
+viewer would notice changed" apart from timing.
+
+:meth:`ProbeResult.to_bytes` packs a result into a fixed binary layout (for
+pipes, rings and files) and :meth:`ProbeResult.from_bytes` reads it back:
+
+* a fixed ``HEADER`` (little-endian): layout version, flags (bit 0 = up,
+  bits 1/2 = players online/max known), edition, detected editions (one 4-bit
+  code each, winner in the low bits), detection source, attempts, port,
+  players online/max as int64 (clamped; any value a server reports, negative
+  ones included, survives) and latency/DNS/ping/duration/timeout in ms as
+  float64 (NaN = unknown);
+* then, in this order, version, MOTD, error and error type as
+  uint32-length-prefixed UTF-8 (``0xFFFFFFFF`` = ``None``); a uint16 span
+  count and per span its flags (uint8), color (uint8-length-prefixed) and
+  text (uint32-length-prefixed); a uint8 phase count and per phase its name
+  (uint8-length-prefixed) and ms (float64).
+"""
+import math
+import struct
+from typing import NamedTuple
+
+from .motd import Span
+
+LAYOUT_VERSION = 2
+HEADER = struct.Struct("<BBBBBBHqq5d")
+
+_UP, _ONLINE, _MAX = 0x01, 0x02, 0x04
+_EDITIONS = ("java", "bedrock")         # codes 1, 2; 0 = none
+_DETECTED = ("race", "cache")           # codes 1, 2; 0 = not an Auto probe
+_TARGET_EDITIONS = ("Java", "Bedrock")  # detected editions, codes 1, 2
+_NONE_STR = 0xFFFFFFFF
+_INT64_MIN, _INT64_MAX = -(1 << 63), (1 << 63) - 1
+_U8, _U16, _U32, _F64 = struct.Struct("<B"), struct.Struct("<H"), struct.Struct("<I"), struct.Struct("<d")
+
+
+class ProbeResult(NamedTuple):
+    up: bool
+    edition: str | None = None                  # "java" / "bedrock" as reported by the probe
+    players_online: int | None = None
+    players_max: int | None = None
+    version: str | None = None
+    motd: str | None = None                     # plain text
+    motd_spans: tuple = ()                      # styled :class:`~mcstat.motd.Span` runs
+    error: str | None = None
+    error_type: str | None = None               # exception class name, for metrics
+    editions: tuple = ()                        # Auto targets: editions that answered, winner first
+    port: int | None = None                     # Auto targets: the port that answered
+    # Measurements, after _COMPARED: not part of equality or the hash
+    latency_ms: float | None = None
+    dns_ms: float | None = None
+    ping_ms: float | None = None
+    duration_ms: float | None = None
+    phases: dict | None = None                  # dotted phase name -> ms
+    attempts: int = 1
+    timeout_ms: float | None = None             # first attempt's timeout under the adaptive policy
+    detected_from: str | None = None            # Auto targets: "race" / "cache"
+
+    def __eq__(self, other):
+        return isinstance(other, ProbeResult) and self[:_COMPARED] == other[:_COMPARED]
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self[:_COMPARED])
+
+    @classmethod
+    def down(cls, e: BaseException, message: str | None = None) -> "ProbeResult":
+        """The error variant; ``error_type`` keeps the exception class for metrics."""
+        return cls(False, error=message or str(e), error_type=type(e).__name__)
+
+    def timed(self, duration_ms: float, phases: dict) -> "ProbeResult":
+        """Copy with the probe's wall time and phase breakdown; ``_replace`` without its overhead."""
+        return self._make((*self[:_DURATION], duration_ms, phases, *self[_DURATION + 2:]))
+
+    def as_dict(self) -> dict:
+        """The JSON shape the CLI prints: players/version nested, unset fields left out."""
+        out = {"up": self.up}
+        if self.up:
+            out.update(edition=self.edition, latency_ms=self.latency_ms,
+                       players={"online": self.players_online, "max": self.players_max},
+                       version={"name": self.version}, motd=self.motd,
+                       motd_spans=[list(s) for s in self.motd_spans], dns_ms=self.dns_ms)
+            if self.ping_ms is not None:
+                out["ping_ms"] = self.ping_ms
+        else:
+            out.update(error=self.error, error_type=self.error_type)
+        if self.editions or self.detected_from:
+            out.update(editions=list(self.editions), detected_from=self.detected_from, port=self.port)
+        out.update(duration_ms=self.duration_ms, phases=self.phases or {}, attempts=self.attempts)
+        if self.timeout_ms is not None:
+            out["timeout_ms"] = self.timeout_ms
+        return out
+
+    # -------------------- Binary layout --------------------
+    def to_bytes(self) -> bytes:
+        flags = _UP if self.up else 0
+        if self.players_online is not None:
+            flags |= _ONLINE
+        if self.players_max is not None:
+            flags |= _MAX
+        editions = 0
+        for i, name in enumerate(self.editions[:2]):
+            editions |= _code(_TARGET_EDITIONS, name) << (4 * i)
+        parts = [HEADER.pack(
+            LAYOUT_VERSION, flags, _code(_EDITIONS, self.edition), editions, _code(_DETECTED, self.detected_from),
+            min(self.attempts, 255), self.port or 0, _int(self.players_online), _int(self.players_max),
+            _float(self.latency_ms), _float(self.dns_ms), _float(self.ping_ms), _float(self.duration_ms),
+            _float(self.timeout_ms))]
+        for text in (self.version, self.motd, self.error, self.error_type):
+            _put_str(parts, text, _U32)
+        parts.append(_U16.pack(len(self.motd_spans)))
+        for span in self.motd_spans:
+            parts.append(_U8.pack(span.flags))
+            _put_str(parts, span.color or "", _U8)
+            _put_str(parts, span.text, _U32)
+        phases = self.phases or {}
+        parts.append(_U8.pack(len(phases)))
+        for name, ms in phases.items():
+            _put_str(parts, name, _U8)
+            parts.append(_F64.pack(ms))
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data) -> "ProbeResult":
+        data = memoryview(data)
+        (layout, flags, edition, editions, detected, attempts, port, online, max_, latency, dns, ping, duration,
+         timeout) = HEADER.unpack_from(data)
+        if layout != LAYOUT_VERSION:
+            raise ValueError(f"unsupported result layout {layout}")
+        pos = HEADER.size
+        strings = []
+        for _ in range(4):
+            text, pos = _get_str(data, pos, _U32)
+            strings.append(text)
+        spans = []
+        (n,), pos = _U16.unpack_from(data, pos), pos + _U16.size
+        for _ in range(n):
+            (span_flags,), pos = _U8.unpack_from(data, pos), pos + _U8.size
+            color, pos = _get_str(data, pos, _U8)
+            text, pos = _get_str(data, pos, _U32)
+            spans.append(Span(text, color or None, span_flags))
+        phases = {}
+        (n,), pos = _U8.unpack_from(data, pos), pos + _U8.size
+        for _ in range(n):
+            name, pos = _get_str(data, pos, _U8)
+            (phases[name],), pos = _F64.unpack_from(data, pos), pos + _F64.size
+        version, motd, error, error_type = strings
+        return cls(
+            bool(flags & _UP), _name(_EDITIONS, edition), online if flags & _ONLINE else None,
+            max_ if flags & _MAX else None, version, motd,
+            tuple(spans), error, error_type, tuple(_name(_TARGET_EDITIONS, code) for code in (editions & 0x0F, editions >> 4) if code),
+            port or None, _opt_float(latency), _opt_float(dns), _opt_float(ping), _opt_float(duration),
+            phases or None, attempts, _opt_float(timeout), _name(_DETECTED, detected))
+
+
+_COMPARED = ProbeResult._fields.index("latency_ms")
+_DURATION = ProbeResult._fields.index("duration_ms")     # followed by phases
+
+
+# -------------------- Layout helpers --------------------
+def _code(names: tuple, name) -> int:
+    return names.index(name) + 1 if name in names else 0
+
+def _name(names: tuple, code: int):
+    return names[code - 1] if code else None
+
+def _int(value) -> int:
+    return 0 if value is None else max(_INT64_MIN, min(int(value), _INT64_MAX))
+
+def _float(value) -> float:
+    return math.nan if value is None else float(value)
+
+def _opt_float(value: float):
+    return None if math.isnan(value) else value
+
+def _put_str(parts: list, text, size: struct.Struct):
+    if text is None:
+        parts.append(size.pack(_NONE_STR))
+        return
+    data = str(text).encode("utf-8")
+    parts.append(size.pack(len(data)))
+    parts.append(data)
+
+def _get_str(data: memoryview, pos: int, size: struct.Struct):
+    (n,) = size.unpack_from(data, pos)
+    pos += size.size
+    if n == _NONE_STR:
+        return None, pos
+    return str(data[pos:pos + n], "utf-8"), pos + n
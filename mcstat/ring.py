@@ -0,0 +1,161 @@
+"""Recent results per target in fixed-size rings, for sparklines.
+
+:class:`RingStore` keeps the last ``capacity`` probes of every target in
+memory, nothing on disk. Like the history store it is a
+:meth:`ResultCache.subscribe` listener, so it sees every real probe once,
+whichever session or the poller caused it::
+
+    rings = RingStore(capacity=120, max_bytes=4 << 20)
+    cache.subscribe(rings.observe)
+    window = rings.window(key)              # or None before the first probe
+    sparkline(window.latency)
+
+Each :class:`Ring` is a few ``array`` columns (time, latency, players, up),
+allocated once at full size. Every sample is written twice, at ``i`` and
+``i + capacity``, so the latest ``n`` samples are always one contiguous run:
+appends are O(1) and :meth:`Ring.window` returns ``memoryview`` slices of it
+without copying. Those views are live (the next append, or another target
+taking over the ring, changes them under the reader), so
+:meth:`RingStore.window`, which other threads append to, returns one flat
+copy of the run taken under its lock.
+
+``max_bytes`` is a hard ceiling over all rings: it fixes how many targets are
+tracked, and a new target takes over the buffers of the one appended to
+least recently. A ``capacity`` whose single ring would not fit is a
+``ValueError``.
+"""
+import math
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import NamedTuple
+
+# Column typecodes: wall time needs double precision, the rest fit in floats/bytes
+_COLUMNS = (("ts", "d"), ("latency", "f"), ("players", "f"), ("up", "B"))
+_NAN = math.nan
+
+
+class Window(NamedTuple):
+    """The latest samples of one target, oldest first: memoryviews into its ring or array copies."""
+    ts: memoryview | array          # time.time() of each probe
+    latency: memoryview | array     # ms; NaN when DOWN
+    players: memoryview | array     # online; NaN when DOWN or unknown
+    up: memoryview | array          # 1 / 0
+
+
+class Ring:
+    __slots__ = ("capacity", "ts", "latency", "players", "up", "_next", "_count")
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        for name, code in _COLUMNS:
+            setattr(self, name, array(code, bytes(2 * capacity * array(code).itemsize)))
+        self.clear()
+
+    @staticmethod
+    def nbytes(capacity: int) -> int:
+        return sum(2 * capacity * array(code).itemsize for _, code in _COLUMNS)
+
+    def clear(self):
+        self._next = 0          # slot of the next append, in [0, capacity)
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, ts: float, latency: float | None, players: int | None, up: bool):
+        i, j = self._next, self._next + self.capacity
+        latency = _NAN if latency is None else latency
+        players = _NAN if players is None else players
+        self.ts[i] = self.ts[j] = ts
+        self.latency[i] = self.latency[j] = latency
+        self.players[i] = self.players[j] = players
+        self.up[i] = self.up[j] = 1 if up else 0
+        self._next = (i + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def window(self, n: int | None = None, copy: bool = False) -> Window:
+        """The latest ``n`` samples (all by default), oldest first; live views unless ``copy``."""
+        n = self._count if n is None else max(0, min(n, self._count))
+        end = self._next + self.capacity
+        if copy:
+            return Window(*(getattr(self, name)[end - n:end] for name, _ in _COLUMNS))
+        return Window(*(memoryview(getattr(self, name))[end - n:end] for name, _ in _COLUMNS))
+
+
+class RingStore:
+    def __init__(self, capacity: int = 120, max_bytes: int = 4 << 20):
+        self.capacity = capacity
+        self.max_bytes = max_bytes
+        self.max_targets = max_bytes // Ring.nbytes(capacity)
+        if not self.max_targets:
+            raise ValueError(f"one ring of {capacity} samples needs {Ring.nbytes(capacity)} bytes, "
+                             f"over max_bytes={max_bytes}")
+        self._lock = threading.Lock()
+        self._rings: OrderedDict = OrderedDict()     # key -> Ring, least recently appended first
+
+    def observe(self, key, result, ts: float | None = None):
+        """Append one :class:`~mcstat.result.ProbeResult`; matches the ResultCache listener signature."""
+        with self._lock:
+            ring = self._rings.get(key)
+            if ring is None:
+                if len(self._rings) >= self.max_targets:
+                    ring = self._rings.popitem(last=False)[1]    # reuse the stalest target's buffers
+                    ring.clear()
+                else:
+                    ring = Ring(self.capacity)
+                self._rings[key] = ring
+            else:
+                self._rings.move_to_end(key)
+            ring.append(time.time() if ts is None else ts, result.latency_ms if result.up else None,
+                        result.players_online if result.up else None, result.up)
+
+    def window(self, key, n: int | None = None) -> Window | None:
+        """A copy of the latest ``n`` samples of ``key``, safe to keep while probes keep appending."""
+        with self._lock:
+            ring = self._rings.get(key)
+            return ring.window(n, copy=True) if ring is not None and len(ring) else None
+
+    def forget(self, key):
+        with self._lock:
+            self._rings.pop(key, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            targets = len(self._rings)
+        return {"targets": targets, "max_targets": self.max_targets,
+                "bytes": targets * Ring.nbytes(self.capacity), "max_bytes": self.max_bytes}
+
+
+# -------------------- Rendering --------------------
+def sparkline(values, width: int = 120, height: int = 28, color: str = "#4C9BE8") -> str:
+    """Inline SVG polyline of ``values`` (NaN = gap, e.g. a DOWN probe); ``""`` if nothing to draw."""
+    points = [(i, v) for i, v in enumerate(values) if v == v]     # v != v: NaN
+    if not points:
+        return ""
+    n = len(values)
+    lo = min(v for _, v in points)
+    hi = max(v for _, v in points)
+    span = (hi - lo) or 1.0
+    step = (width - 2) / (n - 1) if n > 1 else 0.0
+
+    def x(i):
+        return 1 + i * step if n > 1 else width / 2
+
+    def y(v):
+        return height - 1 - (v - lo) * (height - 2) / span
+
+    runs, last = [], None
+    for i, v in points:
+        if last is None or i != last + 1:
+            runs.append([])
+        runs[-1].append((x(i), y(v)))
+        last = i
+    shapes = "".join(
+        f'<polyline points="{" ".join(f"{px:.1f},{py:.1f}" for px, py in run)}" fill="none" '
+        f'stroke="{color}" stroke-width="1.5"/>' if len(run) > 1
+        else f'<circle cx="{run[0][0]:.1f}" cy="{run[0][1]:.1f}" r="1.5" fill="{color}"/>'
+        for run in runs)
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+            f'viewBox="0 0 {width} {height}">{shapes}</svg>')
@@ -0,0 +1,19 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_WORKERS = 32
+
+
+def run_batch(targets, probe, workers: int = DEFAULT_WORKERS) -> tuple[list, float]:
+    """Probe every target in parallel on a bounded thread pool.
+
+    ``probe(target) -> result``; returns ``([(target, result), ...], wall_seconds)``
+    with results in input order.
+    """
+    targets = list(targets)
+    start = time.perf_counter()
+    if not targets:
+        return [], 0.0
+    with ThreadPoolExecutor(max_workers=min(workers, len(targets)), thread_name_prefix="mc-sweep") as pool:
+        results = list(pool.map(probe, targets))
+    return list(zip(targets, results)), time.perf_counter() - start
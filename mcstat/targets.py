@@ -0,0 +1,143 @@
+"""Target list parsing for the dashboard and batch tools.
+
+A target is an ``(edition, host, port)`` tuple, the same shape used as cache
+key everywhere else. Accepted inputs:
+
+- text, one target per line: ``play.example.org``, ``host:25566``,
+  ``bedrock://host:19132``, ``host:19132 bedrock``, ``auto://host`` or
+  ``host,port,edition``
+- CSV with an optional ``host,port,edition`` header
+- TOML with ``targets = ["java://host", ...]`` and/or ``[[target]]`` tables
+"""
+import csv
+import io
+
+DEFAULT_PORTS = {"Java": 25565, "Bedrock": 19132}
+_EDITIONS = {"java": "Java", "bedrock": "Bedrock", "auto": "Auto"}
+
+
+def _edition(name: str | None, default: str = "Java") -> str:
+    if not name:
+        return default
+    try:
+        return _EDITIONS[name.strip().lower()]
+    except KeyError:
+        raise ValueError(f"unknown edition {name!r} (expected Java, Bedrock or Auto)") from None
+
+def _split_host_port(address: str) -> tuple[str, int | None]:
+    address = address.strip()
+    if address.startswith("["):                         # [::1]:25565
+        host, _, rest = address[1:].partition("]")
+        return host, int(rest[1:]) if rest.startswith(":") else None
+    if address.count(":") == 1:
+        host, port = address.split(":")
+        return host, int(port)
+    return address, None
+
+def make_target(host: str, port=None, edition: str | None = None, default_edition: str = "Java") -> tuple:
+    edition = _edition(edition, default_edition)
+    host = host.strip()
+    if not host:
+        raise ValueError("empty host")
+    # Auto without a port races each edition on its own default port (stored as 0)
+    port = int(port) if port not in (None, "") else DEFAULT_PORTS.get(edition, 0)
+    if not 1 <= port <= 65535 and not (edition == "Auto" and port == 0):
+        raise ValueError(f"port out of range: {port}")
+    return edition, host, port
+
+def parse_target(spec: str, default_edition: str = "Java") -> tuple:
+    """Parse a single target written as free text."""
+    spec = spec.strip()
+    if "," in spec:
+        host, port, edition = (spec.split(",") + ["", ""])[:3]
+        return make_target(host, port.strip(), edition.strip() or None, default_edition)
+    edition = None
+    if "://" in spec:
+        edition, spec = spec.split("://", 1)
+    else:
+        address, _, suffix = spec.partition(" ")
+        if suffix.strip():
+            spec, edition = address, suffix
+    host, port = _split_host_port(spec)
+    return make_target(host, port, edition, default_edition)
+
+def format_target(target) -> str:
+    edition, host, port = target
+    return f"{edition.lower()}://{host}" + (f":{port}" if port else "")
+
+def _dedupe(targets) -> list:
+    return list(dict.fromkeys(targets))
+
+def parse_text(text: str) -> list:
+    targets = []
+    for lineno, line in enumerate(text.splitlines(), 1):
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        try:
+            targets.append(parse_target(line))
+        except ValueError as e:
+            raise ValueError(f"line {lineno}: {e}") from None
+    return _dedupe(targets)
+
+def parse_csv(text: str) -> list:
+    rows = [r for r in csv.reader(io.StringIO(text)) if r and not r[0].lstrip().startswith("#")]
+    if rows and rows[0][0].strip().lower() == "host":
+        rows = rows[1:]
+    targets = []
+    for lineno, row in enumerate(rows, 1):
+        host, port, edition = ([c.strip() for c in row] + ["", ""])[:3]
+        try:
+            if port or edition:
+                targets.append(make_target(host, port, edition or None))
+            else:
+                targets.append(parse_target(host))
+        except ValueError as e:
+            raise ValueError(f"row {lineno}: {e}") from None
+    return _dedupe(targets)
+
+def parse_toml(text: str) -> list:
+    try:
+        import tomllib
+    except ImportError:         # Python 3.10
+        try:
+            import tomli as tomllib
+        except ImportError:
+            raise ValueError("TOML target files need Python 3.11+ or the 'tomli' package") from None
+    data = tomllib.loads(text)                          # TOMLDecodeError is a ValueError
+    specs, entries = data.get("targets", []), data.get("target", [])
+    if not isinstance(specs, list):
+        raise ValueError("'targets' must be an array of strings")
+    if not isinstance(entries, list):
+        raise ValueError("'target' must be an array of tables ([[target]])")
+    targets = []
+    for i, spec in enumerate(specs, 1):
+        if not isinstance(spec, str):
+            raise ValueError(f"targets entry {i}: expected a string, got {spec!r}")
+        try:
+            targets.append(parse_target(spec))
+        except ValueError as e:
+            raise ValueError(f"targets entry {i}: {e}") from None
+    for i, entry in enumerate(entries, 1):
+        if not isinstance(entry, dict) or not isinstance(entry.get("host"), str):
+            raise ValueError(f"[[target]] {i}: needs a host string")
+        port, edition = entry.get("port"), entry.get("edition")
+        if not isinstance(port, (int, str, type(None))) or isinstance(port, bool):
+            raise ValueError(f"[[target]] {i}: port must be a number, got {port!r}")
+        if not isinstance(edition, (str, type(None))):
+            raise ValueError(f"[[target]] {i}: edition must be a string, got {edition!r}")
+        try:
+            targets.append(make_target(entry["host"], port, edition))
+        except ValueError as e:
+            raise ValueError(f"[[target]] {i}: {e}") from None
+    return _dedupe(targets)
+
+def load(filename: str, data: bytes) -> list:
+    """Parse an uploaded target file, picking the format from its extension."""
+    text = data.decode("utf-8-sig")
+    name = filename.lower()
+    if name.endswith(".toml"):
+        return parse_toml(text)
+    if name.endswith(".csv"):
+        return parse_csv(text)
+    return parse_text(text)
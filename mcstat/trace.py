@@ -0,0 +1,140 @@
+"""Per-phase timing spans for probes, with an optional OTLP/JSON file exporter.
+
+Every probe carries a :class:`Trace`; each phase (``resolve``, ``status``,
+``motd``, ``ping``) is a span, and the pinned Java server nests ``connect``,
+``handshake`` and ``read`` under ``status``. The result gets a flat
+``phases`` dict of milliseconds (``{"resolve": 0.4, "status.connect": 11.2, …}``).
+
+Spans are only shipped anywhere once an exporter is installed::
+
+    set_exporter(JsonlExporter("probes.otlp.jsonl"))
+
+which appends one OTLP/JSON ``resourceSpans`` document per probe, the format
+the OpenTelemetry collector's file receiver/exporter use.
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import NamedTuple
+
+
+class Span(NamedTuple):
+    name: str
+    parent: int | None      # index into Trace.spans
+    offset: float           # seconds after the trace started
+    duration: float         # seconds
+    error: str | None       # exception class that ended the span
+
+
+class Trace:
+    """Spans of one probe; not shared between threads or tasks."""
+    __slots__ = ("wall", "start", "spans", "_stack")
+
+    def __init__(self):
+        self.wall = time.time()
+        self.start = time.perf_counter()
+        self.spans: list = []
+        self._stack: list = []
+
+    @contextmanager
+    def span(self, name: str):
+        index = len(self.spans)
+        parent = self._stack[-1] if self._stack else None
+        self.spans.append(None)             # keep start order; filled in on exit
+        self._stack.append(index)
+        start = time.perf_counter()
+        error = None
+        try:
+            yield
+        except BaseException as e:          # CancelledError too: a timed-out phase still shows up
+            error = type(e).__name__
+            raise
+        finally:
+            self._stack.pop()
+            self.spans[index] = Span(name, parent, start - self.start, time.perf_counter() - start, error)
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.start) * 1000
+
+    def _path(self, span: Span) -> str:
+        return span.name if span.parent is None else f"{self._path(self.spans[span.parent])}.{span.name}"
+
+    def phases(self) -> dict:
+        """``{"status.connect": ms, …}`` in start order."""
+        return {self._path(s): round(s.duration * 1000, 3) for s in self.spans if s is not None}
+
+
+# -------------------- Export --------------------
+_exporter = None
+
+def set_exporter(exporter):
+    """Install (or with ``None`` remove) the process-wide span exporter."""
+    global _exporter
+    _exporter = exporter
+
+def export(trace: Trace, target, result):
+    if _exporter is not None:
+        _exporter.export(trace, target, result)
+
+
+def _attr(key: str, value) -> dict:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+class JsonlExporter:
+    """Append one OTLP/JSON document per probe to ``path``."""
+
+    def __init__(self, path: str, service: str = "mcstat"):
+        self.path = path
+        self.service = service
+        self._lock = threading.Lock()
+        self._fh = open(path, "a", encoding="utf-8")
+
+    def _document(self, trace: Trace, target, result) -> dict:
+        edition, host, port = target
+        trace_id = os.urandom(16).hex()
+        base_ns = int(trace.wall * 1e9)
+        span_ids = [os.urandom(8).hex() for _ in trace.spans]
+        root_id = os.urandom(8).hex()
+        root = {
+            "traceId": trace_id, "spanId": root_id, "name": "mcstat.probe", "kind": 3,   # CLIENT
+            "startTimeUnixNano": str(base_ns),
+            "endTimeUnixNano": str(base_ns + int((result.duration_ms or trace.elapsed_ms()) * 1e6)),
+            "attributes": [_attr("mc.edition", edition), _attr("server.address", host),
+                           _attr("server.port", port), _attr("mc.up", result.up)],
+            "status": {"code": 1} if result.up else {"code": 2, "message": result.error or ""},
+        }
+        spans = [root]
+        for span_id, s in zip(span_ids, trace.spans):
+            if s is None:
+                continue
+            start_ns = base_ns + int(s.offset * 1e9)
+            spans.append({
+                "traceId": trace_id, "spanId": span_id, "name": s.name, "kind": 1,       # INTERNAL
+                "parentSpanId": root_id if s.parent is None else span_ids[s.parent],
+                "startTimeUnixNano": str(start_ns),
+                "endTimeUnixNano": str(start_ns + int(s.duration * 1e9)),
+                "status": {"code": 2, "message": s.error} if s.error else {"code": 0},
+            })
+        return {"resourceSpans": [{
+            "resource": {"attributes": [_attr("service.name", self.service)]},
+            "scopeSpans": [{"scope": {"name": "mcstat"}, "spans": spans}],
+        }]}
+
+    def export(self, trace: Trace, target, result):
+        import json
+        line = json.dumps(self._document(trace, target, result), separators=(",", ":"))
+        with self._lock:
+            self._fh.write(line + "\n")
+            self._fh.flush()
+
+    def close(self):
+        with self._lock:
+            self._fh.close()